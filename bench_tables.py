@@ -0,0 +1,57 @@
+"""
+Time find_tables_in_sheet over every sheet of a roster workbook.
+
+    python bench_tables.py ["Rooster Amarant (online).xlsx"] [--runs 20] [--output bench_output.txt]
+
+Only RosterSearcher(), read_excel_file and find_tables_in_sheet are used, so the same
+script times older versions of the detector: check out roster_searcher.py from an
+earlier commit and run it again. Older versions always print a preview of each table
+found, so print is switched off in roster_searcher while timing; otherwise formatting
+the previews, not detection, would dominate the numbers.
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+import roster_searcher
+from roster_searcher import RosterSearcher
+
+
+def bench(file_path: str, runs: int) -> str:
+    searcher = RosterSearcher()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sheets = searcher.read_excel_file(file_path)
+    if not sheets:
+        raise SystemExit(f"Could not read any sheets from {file_path}")
+    timings = []
+    n_tables = 0
+    # print(df) formats the frame inside print, so a no-op print skips that work entirely
+    roster_searcher.print = lambda *args, **kwargs: None
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            n_tables = sum(len(searcher.find_tables_in_sheet(df)) for df in sheets.values())
+            timings.append(time.perf_counter() - started)
+    finally:
+        del roster_searcher.print
+    return (f"{file_path}: {len(sheets)} sheets, {n_tables} tables, find_tables_in_sheet over every sheet "
+            f"mean {statistics.mean(timings) * 1000:.1f} ms, min {min(timings) * 1000:.1f} ms ({runs} runs)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark table detection on roster workbooks")
+    parser.add_argument('files', nargs='*', default=['Rooster Amarant (online).xlsx'])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--output', help="also append the results to this file, e.g. bench_output.txt")
+    args = parser.parse_args()
+    lines = [bench(file_path, args.runs) for file_path in args.files]
+    print("\n".join(lines))
+    if args.output:
+        with open(args.output, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 """
 Main application class for the Excel Roster Search GUI
 """
+import os
+import threading
+import time
+from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import ttk, messagebox
 
@@ -10,7 +14,8 @@ from .search_panel import SearchPanel
 from .calendar_widget import CalendarWidget
 from .export_utils import ExportUtils
 
-from roster_searcher import RosterSearcher
+from roster_searcher import RosterSearcher, SearchCancelled
+from roster_cache import default_cache_dir
 
 class RosterSearchApp:
     """Main application class for the Excel Roster Search GUI"""
@@ -32,8 +37,8 @@ class RosterSearchApp:
         except:
             pass  # No icon available, continue without it
             
-        # Initialize roster searcher
-        self.searcher = RosterSearcher()
+        # Initialize roster searcher; parsed workbooks persist across restarts
+        self.searcher = RosterSearcher(cache_dir=default_cache_dir())
         
         # Apply theme
         setup_theme(self.root)
@@ -55,6 +60,14 @@ class RosterSearchApp:
         self.results = []
         self.results_by_date = {}
         
+        # Searches run on a worker thread; each one gets an id so late
+        # updates from a replaced or cancelled search can be ignored
+        self.search_id = 0
+        self.cancel_event = None
+        
+        # Workbook being loaded in the background, as (file_path, cancel event)
+        self.preload = None
+        
     def create_header(self):
         """Create application header"""
         header_frame = ttk.Frame(self.main_container, style='TFrame')
@@ -80,12 +93,18 @@ class RosterSearchApp:
     def create_components(self):
         """Create minimal application components"""
         # File selector
-        self.file_selector = FileSelector(self.main_container)
+        self.file_selector = FileSelector(
+            self.main_container,
+            on_path_changed=self.preload_workbook
+        )
 
         # Search panel
         self.search_panel = SearchPanel(
             self.main_container,
-            on_search_callback=self.run_search
+            on_search_callback=self.run_search,
+            on_cancel_callback=self.cancel_search,
+            on_query_changed=self.update_live_results,
+            on_common_days=self.show_common_days
         )
 
         # Calendar widget (directly under main container)
@@ -120,49 +139,220 @@ class RosterSearchApp:
             self.search_panel.reset_status()
             return
             
-        try:
-            results = self.searcher.search_person_schedule(file_path, name, password)
-            
-            # Store results for later reference
-            self.results = results
-            
-            # Group results by date for calendar highlighting
-            self.results_by_date = {}
-            highlight_dates = []
-            for result in results:
-                date_str = result.get('date')
-                if date_str:
-                    try:
-                        # Standardize date format to YYYY-MM-DD for highlighting
-                        if '-' in date_str:
-                            if date_str[2] == '-' or date_str[1] == '-':  # DD-MM-YYYY format
-                                from datetime import datetime
-                                dt = datetime.strptime(date_str[:10], "%d-%m-%Y")
-                                standard_date = dt.strftime("%Y-%m-%d")
-                            else:  # Already YYYY-MM-DD format
-                                standard_date = date_str[:10]
-                                
-                            if standard_date not in self.results_by_date:
-                                self.results_by_date[standard_date] = []
-                            self.results_by_date[standard_date].append(result)
-                            highlight_dates.append(standard_date)
-                    except Exception:
-                        continue
-            
-            # Highlight dates with results in calendar
-            self.calendar_widget.highlight_dates(highlight_dates)
-            
-            # Update status
-            if results:
-                self.search_panel.set_status(
-                    f"Found {len(results)} results for '{name}'"
-                )
+        # A new search replaces the one still running, if any, and a preload of
+        # another workbook; a preload of this one is left to finish and reused
+        if self.cancel_event:
+            self.cancel_event.set()
+        if self.preload and self.preload[0] != file_path:
+            self.preload[1].set()
+            self.preload = None
+        self.search_id += 1
+        self.cancel_event = threading.Event()
+        self.search_panel.set_searching(True)
+        worker = threading.Thread(
+            target=self._search_worker,
+            args=(self.search_id, self.cancel_event, file_path, name, password),
+            daemon=True
+        )
+        worker.start()
+    
+    def preload_workbook(self, file_path, password=None):
+        """Start loading and indexing a workbook as soon as its path is entered
+        
+        Args:
+            file_path (str): Path entered in the file selector
+            password (str, optional): Workbook password
+        """
+        if self.preload:
+            if self.preload[0] == file_path:
+                return
+            self.preload[1].set()
+            self.preload = None
+        # Only local files: a half-typed link can't be told apart from a bad one without downloading it
+        if not file_path or not os.path.isfile(file_path) \
+                or not file_path.lower().endswith(('.xlsx', '.xlsm', '.xls', '.xlsb', '.ods')):
+            return
+        cancel_event = threading.Event()
+        self.preload = (file_path, cancel_event)
+        
+        def progress(stage, done, total):
+            if cancel_event.is_set():
+                raise SearchCancelled()
+        
+        def worker():
+            try:
+                workbook = self.searcher.preload(file_path, password, progress=progress)
+            except SearchCancelled:
+                return
+            except Exception as e:
+                print(f"Preloading {file_path} failed: {str(e)}")
+                workbook = None
+            self.root.after(0, self._finish_preload, cancel_event, workbook)
+        
+        if not self.cancel_event:
+            self.search_panel.set_status("Loading roster...")
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _finish_preload(self, cancel_event, workbook):
+        """Note on the Tk thread that a preload is done
+        
+        Args:
+            cancel_event (threading.Event): Cancel event of the finished preload
+            workbook (dict): The loaded workbook, None if loading raised
+        """
+        if self.preload and self.preload[1] is cancel_event:
+            self.preload = None
+            if self.cancel_event:
+                return
+            # Unreadable files come back as a workbook without sheets
+            if workbook is None or not workbook['sheets']:
+                self.search_panel.set_status("Could not read this roster, check the file")
             else:
-                self.search_panel.set_status(f"No results found for '{name}'")
-                
+                self.search_panel.set_status("Roster loaded, ready to search")
+    
+    def cancel_search(self):
+        """Abort the running search at its next progress report"""
+        if self.cancel_event:
+            self.cancel_event.set()
+    
+    def _search_worker(self, search_id, cancel_event, file_path, name, password):
+        """Run a search off the Tk thread and hand the outcome back with root.after
+        
+        Args:
+            search_id (int): Id of this search
+            cancel_event (threading.Event): Set to abort the search
+            file_path (str): Workbook path or URL
+            name (str): Name to search for
+            password (str): Workbook password, if any
+        """
+        last_report = [0.0, None]
+        
+        def progress(stage, done, total):
+            if cancel_event.is_set():
+                raise SearchCancelled()
+            # Downloads report every chunk; only pass on a few updates a second
+            now = time.monotonic()
+            if stage == last_report[1] and now - last_report[0] < 0.1:
+                return
+            last_report[:] = [now, stage]
+            self.root.after(0, self._show_progress, search_id, stage, done, total)
+        
+        try:
+            results = self.searcher.search_person_schedule(file_path, name, password, progress=progress)
+        except SearchCancelled:
+            self.root.after(0, self._finish_search, search_id, None, name, None)
         except Exception as e:
-            messagebox.showerror("Search Error", str(e))
+            self.root.after(0, self._finish_search, search_id, None, name, e)
+        else:
+            self.root.after(0, self._finish_search, search_id, results, name, None)
+    
+    def _show_progress(self, search_id, stage, done, total):
+        """Show a progress report from the search worker
+        
+        Args:
+            search_id (int): Id of the reporting search
+            stage (str): 'downloading', 'parsing', 'finding tables', 'indexing', 'searching' or 'waiting'
+            done (int): Bytes (downloading) or sheets done so far, or None
+            total (int): Expected total, or None when unknown
+        """
+        if search_id != self.search_id or not self.cancel_event or self.cancel_event.is_set():
+            return
+        message = stage.capitalize()
+        if stage == 'waiting':
+            message = "Waiting for the roster to finish loading"
+        elif stage == 'downloading' and done:
+            message += f" {done / 1e6:.1f}" + (f" of {total / 1e6:.1f} MB" if total else " MB")
+        elif done and total:
+            message += f" sheet {done}/{total}"
+        self.search_panel.set_status(message + "...")
+    
+    def _finish_search(self, search_id, results, name, error):
+        """Show the outcome of a search on the Tk thread
+        
+        Args:
+            search_id (int): Id of the finished search
+            results (list): Result dictionaries, or None if it failed or was cancelled
+            name (str): Name that was searched for
+            error (Exception): Error the search failed with, if any
+        """
+        if search_id != self.search_id:
+            return
+        self.cancel_event = None
+        self.search_panel.set_searching(False)
+        
+        if error is not None:
+            messagebox.showerror("Search Error", str(error))
             self.search_panel.reset_status()
+            return
+        if results is None:
+            self.search_panel.set_status("Search cancelled")
+            return
+        
+        self._show_results(results, name)
+    
+    def update_live_results(self, text):
+        """Suggest names and show results while the user types
+        
+        Only answers from a workbook that is already loaded and indexed; while
+        it is still loading, typing just waits for Enter as before.
+        
+        Args:
+            text (str): Text currently in the name entry
+        """
+        # Single letters match most of the roster; wait for a second one
+        if len(text) < 2 or self.cancel_event:
+            self.search_panel.show_suggestions([])
+            return
+        workbook = self.searcher.loaded_workbook(self.file_selector.get_file_path(), self.file_selector.get_password())
+        if workbook is None:
+            return
+        names = self.searcher.suggest_names(workbook, text)
+        self.search_panel.show_suggestions([n for n in names if n.lower() != text.lower()])
+        if names:
+            self._show_results(self.searcher.search_loaded(workbook, text), text)
+    
+    def _show_results(self, results, name):
+        """Store results, highlight their dates and report the count
+        
+        Args:
+            results (list): Result dictionaries
+            name (str): Name that was searched for
+        """
+        # Store results for later reference
+        self.results = results
+        
+        # Group results by date for calendar highlighting
+        self.results_by_date = {}
+        highlight_dates = []
+        for result in results:
+            date_str = result.get('date')
+            if date_str:
+                try:
+                    # Standardize date format to YYYY-MM-DD for highlighting
+                    if '-' in date_str:
+                        if date_str[2] == '-' or date_str[1] == '-':  # DD-MM-YYYY format
+                            dt = datetime.strptime(date_str[:10], "%d-%m-%Y")
+                            standard_date = dt.strftime("%Y-%m-%d")
+                        else:  # Already YYYY-MM-DD format
+                            standard_date = date_str[:10]
+                            
+                        if standard_date not in self.results_by_date:
+                            self.results_by_date[standard_date] = []
+                        self.results_by_date[standard_date].append(result)
+                        highlight_dates.append(standard_date)
+                except Exception:
+                    continue
+        
+        # Highlight dates with results in calendar
+        self.calendar_widget.highlight_dates(highlight_dates)
+        
+        # Update status
+        if results:
+            self.search_panel.set_status(
+                f"Found {len(results)} results for '{name}'"
+            )
+        else:
+            self.search_panel.set_status(f"No results found for '{name}'")
     
     def on_calendar_date_selected(self, date_str):
         """Handle calendar date selection
@@ -170,6 +360,9 @@ class RosterSearchApp:
         Args:
             date_str (str): Selected date in YYYY-MM-DD format
         """
+        if self.calendar_widget.get_mode() != 'person':
+            self.show_who_works(date_str, self.calendar_widget.get_mode())
+            return
         # If we have results for this date, filter and show only those
         if date_str in self.results_by_date:
             date_results = self.results_by_date[date_str]
@@ -185,6 +378,76 @@ class RosterSearchApp:
         elif self.results:
             self.search_panel.set_status(f"No results for {date_str}")
     
+    def _loaded_roster(self, retry_hint):
+        """Path and password of the roster if it is loaded; otherwise start loading it and say so
+        
+        Args:
+            retry_hint (str): What to do once it has loaded, shown in the status bar
+            
+        Returns:
+            tuple: (file_path, password), or None while the roster isn't loaded
+        """
+        file_path = self.file_selector.get_file_path()
+        password = self.file_selector.get_password()
+        # Answer from the loaded roster only; parsing here would freeze the window
+        if not file_path or self.searcher.loaded_workbook(file_path, password) is None:
+            self.preload_workbook(file_path, password)
+            self.search_panel.set_status(f"Load a roster first, then {retry_hint}")
+            return None
+        return file_path, password
+    
+    def show_common_days(self, names, working):
+        """Highlight the days on which all of names work, or all are free
+        
+        Args:
+            names (list): Names of the people in the group
+            working (bool): True for shared work days, False for shared free days
+        """
+        roster = self._loaded_roster("try again")
+        if roster is None:
+            return
+        file_path, password = roster
+        try:
+            if working:
+                days = self.searcher.common_work_days(file_path, names, password=password)
+            else:
+                days = self.searcher.common_free_days(file_path, names, password=password)
+        except ValueError as e:
+            messagebox.showerror("Search Error", str(e))
+            return
+        self.calendar_widget.show_common_days(days, working)
+        what = "working" if working else "free"
+        self.search_panel.set_status(f"{len(days)} days with {', '.join(names)} all {what}")
+    
+    def show_who_works(self, date_str, mode):
+        """Show everyone scheduled on the selected day or in its week
+        
+        Args:
+            date_str (str): Selected date in YYYY-MM-DD format
+            mode (str): 'day' or 'week'
+        """
+        roster = self._loaded_roster("pick the day again")
+        if roster is None:
+            return
+        file_path, password = roster
+        day = datetime.strptime(date_str, "%Y-%m-%d").date()
+        if mode == 'week':
+            start = day - timedelta(days=day.weekday())
+            when, title = (start, start + timedelta(days=6)), f"Week {day.isocalendar()[1]}"
+        else:
+            when, title = day, date_str
+        rows = self.searcher.who_works_on(file_path, when, password)
+        if rows.empty:
+            self.search_panel.set_status(f"Nobody is scheduled in {title}")
+            return
+        info_lines = [f"Scheduled in {title}:"]
+        for (shift_date, sheet), group in rows.groupby(['date', 'sheet'], observed=True, sort=False):
+            info_lines.append(f"\n{shift_date:%a %d-%m-%Y} ({sheet})")
+            for person, shift in zip(group['person'], group['shift']):
+                info_lines.append(f"  {person}" if str(shift).strip() == person else f"  {person}: {shift}")
+        messagebox.showinfo("Who works", "\n".join(info_lines))
+        self.search_panel.set_status(f"{rows['person'].nunique()} people scheduled in {title}")
+    
     def save_results(self, results):
         """Save search results to a file
         
@@ -75,6 +75,17 @@ class CalendarWidget(ttk.Frame):
         )
         self.date_label.pack(side='left')
         
+        # What clicking a day shows: the searched person's results, or everyone
+        # scheduled that day or that week
+        self.mode_var = tk.StringVar(value='person')
+        for text, mode in (("Who works this week", 'week'), ("Who works this day", 'day'), ("Search results", 'person')):
+            ttk.Radiobutton(
+                self.date_info_frame,
+                text=text,
+                value=mode,
+                variable=self.mode_var
+            ).pack(side='right', padx=(10, 0))
+        
         # Initialize with current date
         today = datetime.now().strftime('%Y-%m-%d')
         self.calendar.selection_set(today)
@@ -97,6 +108,10 @@ class CalendarWidget(ttk.Frame):
         except ValueError:
             self.date_label.config(text="Invalid date format")
     
+    def get_mode(self):
+        """Return the click mode: 'person', 'day' or 'week'"""
+        return self.mode_var.get()
+    
     def get_selected_date(self):
         """Return the currently selected date"""
         return self.calendar.get_date()
@@ -109,6 +124,30 @@ class CalendarWidget(ttk.Frame):
         except ValueError:
             pass  # Invalid date format, ignore
     
+    def clear_highlights(self):
+        """Remove all highlighted dates"""
+        self.calendar.calevent_remove('all')
+    
+    def show_common_days(self, dates, working):
+        """Highlight only the days a group shares, replacing earlier highlights
+        
+        Args:
+            dates (list): Dates (datetime.date) the group is all working or all free
+            working (bool): True for shared work days, False for shared free days
+        """
+        self.clear_highlights()
+        tag = "common_work" if working else "common_free"
+        label = "Working together" if working else "Free together"
+        for day in dates:
+            self.calendar.calevent_create(day, label, tag)
+        self.calendar.tag_config(
+            tag,
+            background=COLORS['secondary'] if working else COLORS['warning'],
+            foreground=COLORS['text_light']
+        )
+        if dates:
+            self.calendar.see(dates[0])
+    
     def highlight_dates(self, dates, color=None):
         """Highlight specific dates in the calendar
         
@@ -9,9 +9,11 @@ from .theme import COLORS, FONTS, create_button, create_label, create_entry
 class FileSelector(ttk.Frame):
     """Component for selecting Excel files or entering SharePoint/OneDrive links"""
     
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, on_path_changed=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.configure(style='TFrame', padding=(10, 10, 10, 5))
+        self.on_path_changed = on_path_changed
+        self._path_change_job = None
         
         # Create a header
         self.header_label = ttk.Label(
@@ -91,6 +93,17 @@ class FileSelector(ttk.Frame):
             self.open_browser_button.state(['!disabled'])
         else:
             self.open_browser_button.state(['disabled'])
+        
+        # Report the path once typing pauses, not on every keystroke
+        if self.on_path_changed:
+            if self._path_change_job:
+                self.after_cancel(self._path_change_job)
+            self._path_change_job = self.after(400, self._notify_path_changed)
+    
+    def _notify_path_changed(self):
+        """Pass the settled path and password to the on_path_changed callback"""
+        self._path_change_job = None
+        self.on_path_changed(self.get_file_path(), self.get_password())
 
     def _open_in_browser(self):
         """Open the SharePoint or OneDrive link in the default browser"""
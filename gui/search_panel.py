@@ -3,15 +3,20 @@ Search panel component for the Excel Roster Search application
 """
 import tkinter as tk
 from tkinter import ttk
-from .theme import create_button, create_label, create_entry, show_error
+from .theme import COLORS, FONTS, create_button, create_label, create_entry, show_error
 
 class SearchPanel(ttk.Frame):
     """Component for entering search criteria and executing searches"""
     
-    def __init__(self, parent, on_search_callback=None, **kwargs):
+    def __init__(self, parent, on_search_callback=None, on_cancel_callback=None,
+                 on_query_changed=None, on_common_days=None, **kwargs):
         super().__init__(parent, **kwargs)
         self.configure(style='TFrame', padding=(10, 5, 10, 10))
         self.on_search_callback = on_search_callback
+        self.on_cancel_callback = on_cancel_callback
+        self.on_query_changed = on_query_changed
+        self.on_common_days = on_common_days
+        self._query_job = None
         
         # Create search input components
         self.search_frame = ttk.Frame(self, style='TFrame')
@@ -25,6 +30,19 @@ class SearchPanel(ttk.Frame):
         self.name_entry.grid(row=0, column=1, padx=5, pady=5, sticky='we')
         self.name_entry.insert(0, "Naam")  # Default placeholder
         
+        # Name suggestions while typing, shown only when there are any
+        self.suggestion_list = tk.Listbox(
+            self.search_frame,
+            height=5,
+            font=FONTS['small'],
+            foreground=COLORS['text'],
+            selectbackground=COLORS['secondary'],
+            activestyle='none'
+        )
+        self.suggestion_list.grid(row=1, column=1, padx=5, sticky='we')
+        self.suggestion_list.grid_remove()
+        self.suggestion_list.bind("<<ListboxSelect>>", self._pick_suggestion)
+        
         # Search button with improved styling
         button_frame = ttk.Frame(self, style='TFrame')
         button_frame.pack(fill='x', pady=(10, 0))
@@ -35,7 +53,39 @@ class SearchPanel(ttk.Frame):
             command=self._execute_search,
             width=15
         )
-        self.search_button.pack(pady=5)
+        self.search_button.pack(side='left', expand=True, anchor='e', padx=5, pady=5)
+        
+        self.cancel_button = create_button(
+            button_frame,
+            "Cancel",
+            command=self._cancel_search,
+            width=10
+        )
+        self.cancel_button.pack(side='left', expand=True, anchor='w', padx=5, pady=5)
+        self.cancel_button.state(['disabled'])
+        
+        # Days shared by several people, entered comma-separated
+        common_frame = ttk.Frame(self, style='TFrame')
+        common_frame.pack(fill='x')
+        
+        self.common_label = create_label(common_frame, "Several names, comma-separated:")
+        self.common_label.pack(side='left', padx=5)
+        
+        self.free_button = create_button(
+            common_frame,
+            "Free together",
+            command=lambda: self._find_common_days(False),
+            width=15
+        )
+        self.free_button.pack(side='left', padx=5, pady=5)
+        
+        self.work_button = create_button(
+            common_frame,
+            "Working together",
+            command=lambda: self._find_common_days(True),
+            width=17
+        )
+        self.work_button.pack(side='left', padx=5, pady=5)
         
         # Status message
         self.status_var = tk.StringVar()
@@ -54,6 +104,48 @@ class SearchPanel(ttk.Frame):
         self.name_entry.focus_set()
         # Bind Enter key to search
         self.name_entry.bind("<Return>", lambda event: self._execute_search())
+        self.name_entry.bind("<KeyRelease>", self._schedule_query)
+
+    def _schedule_query(self, event=None):
+        """Report the typed text once keystrokes pause for a moment"""
+        if event is not None and event.keysym in ('Return', 'KP_Enter', 'Escape', 'Tab'):
+            return
+        if not self.on_query_changed:
+            return
+        if self._query_job:
+            self.after_cancel(self._query_job)
+        self._query_job = self.after(150, self._notify_query_changed)
+
+    def _notify_query_changed(self):
+        """Pass the current text to the on_query_changed callback"""
+        self._query_job = None
+        self.on_query_changed(self.get_search_name())
+
+    def _pick_suggestion(self, event=None):
+        """Search for the suggestion that was clicked"""
+        selection = self.suggestion_list.curselection()
+        if not selection:
+            return
+        name = self.suggestion_list.get(selection[0])
+        self.name_entry.delete(0, tk.END)
+        self.name_entry.insert(0, name)
+        self.show_suggestions([])
+        self._execute_search()
+
+    def show_suggestions(self, names):
+        """Show name suggestions under the entry, or hide the list when there are none
+        
+        Args:
+            names (list): Suggested names, best first
+        """
+        self.suggestion_list.delete(0, tk.END)
+        for name in names:
+            self.suggestion_list.insert(tk.END, name)
+        if names:
+            self.suggestion_list.configure(height=min(len(names), 5))
+            self.suggestion_list.grid()
+        else:
+            self.suggestion_list.grid_remove()
 
     def _execute_search(self):
         """Execute the search with the provided name"""
@@ -64,10 +156,42 @@ class SearchPanel(ttk.Frame):
             return
         
         self.status_var.set("Searching...")
+        self.show_suggestions([])
+        if self._query_job:
+            self.after_cancel(self._query_job)
+            self._query_job = None
         
         if self.on_search_callback:
             self.on_search_callback(search_name)
     
+    def _find_common_days(self, working):
+        """Look up the days the entered people all work, or all have off
+        
+        Args:
+            working (bool): True for shared work days, False for shared free days
+        """
+        names = [name.strip() for name in self.get_search_name().split(',') if name.strip()]
+        if not names or names == ["Naam"]:
+            show_error("Search Error", "Please enter one or more names, separated by commas.")
+            return
+        self.show_suggestions([])
+        if self.on_common_days:
+            self.on_common_days(names, working)
+    
+    def _cancel_search(self):
+        """Ask the running search to stop"""
+        self.status_var.set("Cancelling...")
+        if self.on_cancel_callback:
+            self.on_cancel_callback()
+    
+    def set_searching(self, searching):
+        """Enable the Cancel button while a search is running
+        
+        Args:
+            searching (bool): Whether a search is in progress
+        """
+        self.cancel_button.state(['!disabled'] if searching else ['disabled'])
+    
     def get_search_name(self):
         """Return the currently entered search name"""
         return self.name_entry.get().strip()
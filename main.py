@@ -1,6 +1,7 @@
 import sys
 import tkinter as tk
 from roster_searcher import RosterSearcher
+from roster_cache import default_cache_dir
 from gui.app import RosterSearchApp
 
 def launch_gui():
@@ -9,7 +10,7 @@ def launch_gui():
     root.mainloop()
 
 def main():
-    searcher = RosterSearcher()
+    searcher = RosterSearcher(cache_dir=default_cache_dir())
     print("Excel Roster Search Program")
     print("=" * 50)
     file_path = input("Enter the path to your Excel file (local path or URL): ").strip()
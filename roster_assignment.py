@@ -0,0 +1,162 @@
+import sys
+from collections.abc import Mapping
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from roster_index import clean_name
+
+
+@lru_cache(maxsize=4096)
+def parse_day(text: str) -> date:
+    """date for a 'YYYY-MM-DD' string; schedules reuse the same few hundred days"""
+    return date.fromisoformat(text)
+
+
+class Assignment(Mapping):
+    """
+    One scheduled cell found for a person.
+
+    Stored as typed slots (a native date, integer row/col within the table, an
+    interned sheet name) instead of a dict per hit. It still reads like the old
+    result dict, with keys 'name', 'date' ('YYYY-MM-DD'), 'position', 'context',
+    'table_type', 'sheet' and 'source', so code using result.get(...) keeps working.
+    """
+
+    __slots__ = ('name', 'date', 'row', 'col', 'context', 'table_type', 'sheet', 'source')
+
+    # Keys that may be set through the dict view, as the searcher did on result dicts
+    _SETTABLE = ('sheet', 'source')
+
+    def __init__(self, name: str, day: date, row: int, col: int, context: str, table_type: str,
+                 sheet: Optional[str] = None, source: Optional[str] = None):
+        self.name = name
+        self.date = day
+        self.row = row
+        self.col = col
+        self.context = context
+        self.table_type = table_type
+        self.sheet = sys.intern(sheet) if sheet is not None else None
+        self.source = source
+
+    @property
+    def position(self) -> str:
+        return f"Row {self.row + 1}, Col {self.col + 1}"
+
+    def _keys(self):
+        keys = ['name', 'date', 'position', 'context', 'table_type']
+        if self.sheet is not None:
+            keys.append('sheet')
+        if self.source is not None:
+            keys.append('source')
+        return keys
+
+    def __getitem__(self, key: str):
+        if key not in self._keys():
+            raise KeyError(key)
+        if key == 'date':
+            return self.date.strftime('%Y-%m-%d')
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self._SETTABLE:
+            raise KeyError(f"'{key}' can't be set on an Assignment")
+        setattr(self, key, sys.intern(value) if key == 'sheet' else value)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def to_dict(self) -> dict:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"Assignment({self.to_dict()!r})"
+
+
+ASSIGNMENT_COLUMNS = ['person', 'person_number', 'date', 'weekday', 'shift', 'sheet', 'table', 'row', 'col',
+                      'table_type']
+
+
+def build_assignments(index, workbook_tables: Dict[str, List[Dict]]) -> pd.DataFrame:
+    """
+    Explode a workbook into one row per (person, scheduled cell), the whole roster as a table.
+
+    A dated schedule cell on a row that starts with a kandidaten number gives a
+    'schedule_by_number' row for the candidate with that number, its text being their shift.
+    The cells the index takes for names (see RosterIndex.person_cells) give a 'schedule'
+    row for the name written in them; banners such as public holidays give no row. row and
+    col are positions within the table, as in Assignment. Repeated strings are categoricals
+    and missing person numbers are <NA>.
+    """
+    columns = {name: [] for name in ASSIGNMENT_COLUMNS}
+
+    def add(person, person_number, cell, table_type):
+        sheet_name, table_idx, i, col, day, text = cell
+        columns['person'].append(person)
+        columns['person_number'].append(person_number)
+        columns['date'].append(day)
+        columns['shift'].append(text)
+        columns['sheet'].append(sheet_name)
+        columns['table'].append(table_idx)
+        columns['row'].append(i)
+        columns['col'].append(col)
+        columns['table_type'].append(table_type)
+
+    for cell_id in index.person_cells:
+        cell = index.cells[cell_id]
+        add(clean_name(cell[5]), None, cell, 'schedule')
+    for sheet_name, tables in workbook_tables.items():
+        for table in tables:
+            if table['type'] == 'kandidaten':
+                for candidate in table['candidates']:
+                    for cell_id in index.cells_for_number(sheet_name, candidate['number']):
+                        add(clean_name(candidate['name']) or candidate['name'], candidate['number'],
+                            index.cells[cell_id], 'schedule_by_number')
+
+    dates = pd.to_datetime(pd.Series(columns['date'], dtype=object), format='%Y-%m-%d')
+    frame = pd.DataFrame({
+        'person': pd.Categorical(columns['person']),
+        'person_number': pd.array(columns['person_number'], dtype='Int32'),
+        'date': dates,
+        'weekday': (dates.dt.weekday + 1).astype('int8'),
+        'shift': pd.Categorical(columns['shift']),
+        'sheet': pd.Categorical(columns['sheet'], categories=list(workbook_tables)),
+        'table': np.array(columns['table'], dtype=np.int16),
+        'row': np.array(columns['row'], dtype=np.int32),
+        'col': np.array(columns['col'], dtype=np.int16),
+        'table_type': pd.Categorical(columns['table_type'], categories=['schedule', 'schedule_by_number']),
+    })
+    return frame.sort_values(['date', 'sheet', 'table', 'row', 'col'], kind='stable', ignore_index=True)
+
+
+class DateIndex:
+    """
+    Where each day's rows start and stop in a date-sorted assignments table, so the
+    rows for a day are one dict lookup and those for a date range two binary searches.
+    """
+
+    __slots__ = ('days', 'starts', 'stops', 'bounds')
+
+    def __init__(self, frame: pd.DataFrame):
+        values = frame['date'].to_numpy().astype('datetime64[D]')
+        self.days, starts = np.unique(values, return_index=True)
+        self.starts = starts
+        self.stops = np.append(starts[1:], len(values))
+        self.bounds = {day: (int(start), int(stop))
+                       for day, start, stop in zip(self.days.tolist(), self.starts, self.stops)}
+
+    def rows(self, start: date, end: Optional[date] = None) -> slice:
+        """Row slice of the table covering start through end (inclusive)"""
+        if end is None or end == start:
+            return slice(*self.bounds.get(start, (0, 0)))
+        lo = int(np.searchsorted(self.days, np.datetime64(start, 'D'), 'left'))
+        hi = int(np.searchsorted(self.days, np.datetime64(end, 'D'), 'right'))
+        if lo >= hi:
+            return slice(0, 0)
+        return slice(int(self.starts[lo]), int(self.stops[hi - 1]))
@@ -0,0 +1,125 @@
+import hashlib
+import os
+import pickle
+import struct
+import threading
+import zlib
+from typing import Dict, Optional
+
+# Bump whenever the layout of a cached workbook record changes, including
+# changes to the table dicts produced by RosterSearcher.find_tables_in_sheet
+FORMAT_VERSION = 6
+
+_MAGIC = b'RSTC'
+_HEADER = struct.Struct('>4sH')
+
+
+def default_cache_dir() -> str:
+    """Per-user directory for parsed roster workbooks"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'roster_search')
+
+
+class RosterDiskCache:
+    """
+    On-disk store of parsed workbooks (sheets plus detected tables), keyed by
+    the same fingerprints RosterSearcher uses for its in-memory cache, and of
+    the HTTP validators and last body downloaded for each roster URL.
+    Each entry is a small header followed by a zlib-compressed pickle.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str, suffix: str = '.rstc') -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + suffix)
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._load(self._path(key), key)
+
+    def put(self, key: str, entry: Dict):
+        self._store(self._path(key), key, entry)
+
+    def invalidate(self, key: str):
+        self._remove(self._path(key))
+
+    def get_url_state(self, url: str) -> Optional[Dict]:
+        return self._load(self._path(url, '.rstv'), url)
+
+    def put_url_state(self, url: str, state: Dict):
+        self._store(self._path(url, '.rstv'), url, state)
+
+    def invalidate_url_state(self, url: str):
+        self._remove(self._path(url, '.rstv'))
+
+    def _load(self, path: str, key: str) -> Optional[Dict]:
+        try:
+            with open(path, 'rb') as f:
+                magic, version = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or version != FORMAT_VERSION:
+                    raise ValueError(f"stale cache format {version}")
+                stored_key, entry = pickle.loads(zlib.decompress(f.read()))
+            if stored_key != key:
+                return None
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Discarding unreadable cache entry '{path}': {str(e)}")
+            self._remove(path)
+            return None
+
+    def _store(self, path: str, key: str, entry: Dict):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            payload = zlib.compress(pickle.dumps((key, entry), protocol=pickle.HIGHEST_PROTOCOL), 1)
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION))
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: Could not write cache entry: {str(e)}")
+            self._remove(tmp_path)
+            return
+        self._evict()
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(('.rstc', '.rstv')):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        # Oldest entries go first until the directory fits the budget
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,96 @@
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Cell types, one int8 per cell of a sheet
+EMPTY = 0       # missing or blank
+WEEK = 1        # "Week 12" table header
+DAY = 2         # Dutch day name heading a schedule column
+DATE = 3        # date value or date literal such as 17-03-2025
+KANDIDATEN = 4  # header of a kandidaten list
+NUMBER = 5      # whole number, e.g. a person number in a schedule's first column
+TEXT = 6        # anything else: names, shifts, remarks
+
+DAY_NUMBERS = {
+    'maandag': 1, 'dinsdag': 2, 'woensdag': 3, 'donderdag': 4,
+    'vrijdag': 5, 'zaterdag': 6, 'zondag': 7
+}
+
+# Public holidays planners write across a day instead of names
+_HOLIDAY_RE = re.compile(
+    r'(?:(?:1e|2e|eerste|tweede)\s+)?(?:nieuwjaarsdag|nieuwjaar|goede\s+vrijdag|pasen|paasdag|paaszondag'
+    r'|paasmaandag|koningsdag|koninginnedag|bevrijdingsdag|hemelvaart(?:sdag)?|pinksteren|pinksterdag'
+    r'|pinkstermaandag|kerstmis|kerstdag|kerst|feestdag)', re.I)
+_WEEK_RE = re.compile(r'Week\s*\d+', re.I)
+_DATE_RE = re.compile(r'\d{1,2}-\d{1,2}-\d{4}|\d{1,2}/\d{1,2}/\d{4}|\d{4}-\d{1,2}-\d{1,2}|\d{1,2}\.\d{1,2}\.\d{4}')
+_NUMBER_RE = re.compile(r'\d+')
+
+
+def classify_value(value) -> int:
+    """Type of a single non-missing cell value"""
+    text = str(value).strip()
+    if not text:
+        return EMPTY
+    if _WEEK_RE.match(text):
+        return WEEK
+    lowered = text.lower()
+    if 'kandidaten' in lowered:
+        return KANDIDATEN
+    if lowered in DAY_NUMBERS:
+        return DAY
+    if isinstance(value, date) or _DATE_RE.search(text):
+        return DATE
+    if text.isdigit():
+        return NUMBER
+    return TEXT
+
+
+def classify_cells(values: np.ndarray, present: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Type of every cell of a 2-D object array, as an int8 array of the same shape.
+    Each distinct value is classified once; rosters repeat the same names and shifts
+    in cell after cell, so this touches far fewer strings than there are cells.
+    """
+    if present is None:
+        present = pd.notna(values)
+    types = np.zeros(values.size, dtype=np.int8)
+    cells = np.flatnonzero(present)
+    seen = {}
+    codes = []
+    for value in values.ravel()[cells].tolist():
+        key = (type(value), value)
+        cell_type = seen.get(key)
+        if cell_type is None:
+            cell_type = seen[key] = classify_value(value)
+        codes.append(cell_type)
+    types[cells] = codes
+    return types.reshape(values.shape)
+
+
+def is_holiday(text: str) -> bool:
+    """Whether a schedule cell holds a public holiday, such as "HEMELVAART" or "2e Paasdag", not a name"""
+    return _HOLIDAY_RE.fullmatch(' '.join(str(text).split())) is not None
+
+
+def day_number(value) -> Optional[int]:
+    """ISO weekday (1 = maandag) of a day-name cell"""
+    return DAY_NUMBERS.get(str(value).strip().lower())
+
+
+def week_number(value) -> Optional[int]:
+    """The week number in a "Week N" header cell"""
+    match = _NUMBER_RE.search(str(value))
+    return int(match.group()) if match else None
+
+
+@lru_cache(maxsize=4096)
+def iso_date(year: int, week: int, weekday: int) -> Optional[str]:
+    """'YYYY-MM-DD' of a day in an ISO week, or None when the week doesn't exist in that year"""
+    try:
+        return date.fromisocalendar(year, week, weekday).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
@@ -0,0 +1,153 @@
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import roster_cells
+
+_TOKEN_RE = re.compile(r'\w+')
+# Remarks such as "(ziek)" or "(tot 16.30)" after a name in a schedule cell
+_REMARK_RE = re.compile(r'\s*\(.*?\)\s*$')
+_LETTER_RE = re.compile(r'[^\W\d_]')
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercased word tokens, the unit both cells and queries are indexed by"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def clean_name(text: str) -> Optional[str]:
+    """The name in a kandidaten or schedule cell, without remarks and extra spaces; None if it has no letters"""
+    name = ' '.join(_REMARK_RE.sub('', text).split())
+    return name if _LETTER_RE.search(name) else None
+
+
+class RosterIndex:
+    """
+    Inverted index over the schedule tables of one workbook.
+
+    Every non-empty dated schedule cell becomes a posting
+    (sheet, table, row, col, date, text), numbered in the same sheet/table/row/col
+    order a full scan visits them. Name tokens map to the postings that contain
+    them and, per sheet, kandidaten numbers in a schedule's first column map to
+    the postings on those rows.
+
+    Cells on a row that resolves to a kandidaten number hold that candidate's shift,
+    not a name, and cells holding a public holiday (see roster_cells.is_holiday) mark
+    a day off. The other cells name the person scheduled in them; their ids are kept
+    in person_cells. The names from kandidaten lists and those cells, with how often
+    each occurs, back prefix suggestions.
+    """
+
+    def __init__(self):
+        self.cells = []
+        self.postings = {}
+        self.numbers = {}
+        self.person_cells = []
+        self._vocab_hits = {}
+        self.names = {}
+        self._name_keys = None
+
+    @classmethod
+    def build(cls, workbook_tables: Dict[str, List[Dict]],
+              get_schedule_dates: Callable[[Dict], Dict[int, str]],
+              get_cell_types: Callable[[Dict], np.ndarray]) -> 'RosterIndex':
+        index = cls()
+        for sheet_name, tables in workbook_tables.items():
+            candidate_numbers = {str(candidate['number']) for table in tables if table['type'] == 'kandidaten'
+                                 for candidate in table['candidates']}
+            for table_idx, table in enumerate(tables):
+                if table['type'] == 'schedule':
+                    index._add_schedule_table(sheet_name, table_idx, table, get_schedule_dates(table),
+                                              get_cell_types(table), candidate_numbers)
+                elif table['type'] == 'kandidaten':
+                    for candidate in table['candidates']:
+                        index._add_name(candidate['name'])
+        return index
+
+    def _add_name(self, text: str) -> Optional[str]:
+        name = clean_name(text)
+        if name:
+            self.names[name] = self.names.get(name, 0) + 1
+        return name
+
+    def _add_schedule_table(self, sheet_name: str, table_idx: int, table: Dict, dates: Dict[int, str],
+                            types: np.ndarray, candidate_numbers: set):
+        values = table['data'].to_numpy(dtype=object)
+        date_cols = [(col, date) for col, date in dates.items() if date]
+        for i in range(1, len(values)):
+            # Only whole numbers can be looked up as kandidaten numbers
+            row_number = str(values[i, 0]).strip() if types[i, 0] == roster_cells.NUMBER else None
+            for col, date in date_cols:
+                if types[i, col] == roster_cells.EMPTY:
+                    continue
+                text = str(values[i, col])
+                cell_id = len(self.cells)
+                self.cells.append((sheet_name, table_idx, i, col, date, text))
+                for token in set(normalize_tokens(text)):
+                    self.postings.setdefault(token, []).append(cell_id)
+                if row_number:
+                    self.numbers.setdefault((sheet_name, row_number), []).append(cell_id)
+                if row_number in candidate_numbers or roster_cells.is_holiday(text):
+                    continue
+                if self._add_name(text):
+                    self.person_cells.append(cell_id)
+
+    def _cells_with_token_containing(self, query_token: str) -> set:
+        hits = self._vocab_hits.get(query_token)
+        if hits is None:
+            # Substring semantics: scan the (small) vocabulary, not the cells
+            hits = set()
+            for token, cell_ids in self.postings.items():
+                if query_token in token:
+                    hits.update(cell_ids)
+            self._vocab_hits[query_token] = hits
+        return hits
+
+    def find_cells(self, name: str) -> Optional[List[int]]:
+        """
+        Ids of the cells whose text contains name (case-insensitive), in scan order.
+        Returns None for queries without word characters, which the index cannot answer.
+        """
+        query_tokens = normalize_tokens(name)
+        if not query_tokens:
+            return None
+        candidates = None
+        for query_token in query_tokens:
+            hits = self._cells_with_token_containing(query_token)
+            candidates = set(hits) if candidates is None else candidates & hits
+            if not candidates:
+                return []
+        needle = name.lower()
+        return sorted(cell_id for cell_id in candidates if needle in self.cells[cell_id][5].lower())
+
+    def cells_for_number(self, sheet_name: str, person_number: int) -> List[int]:
+        return self.numbers.get((sheet_name, str(person_number)), [])
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Names with a word starting with prefix (case-insensitive), most frequent first.
+        A binary search over the sorted word suffixes of every name, so typing stays cheap
+        however many cells the workbook has.
+        """
+        needle = ' '.join(prefix.lower().split())
+        if not needle:
+            return []
+        if self._name_keys is None:
+            # "nikki blaak" is found from "nik" and from "bla"
+            keys = []
+            for name in self.names:
+                lowered = name.lower()
+                for match in _TOKEN_RE.finditer(lowered):
+                    keys.append((lowered[match.start():], name))
+            keys.sort()
+            self._name_keys = keys
+        keys = self._name_keys
+        found = set()
+        for i in range(bisect_left(keys, (needle,)), len(keys)):
+            key, name = keys[i]
+            if not key.startswith(needle):
+                break
+            found.add(name)
+        return sorted(found, key=lambda name: (-self.names[name], name))[:limit]
@@ -0,0 +1,128 @@
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class ScheduleMatrix:
+    """
+    Who works on which day, as one bit per person per day.
+
+    Rows are the people in an assignments table (see roster_assignment.build_assignments):
+    candidates scheduled by kandidaten number and names written in schedule cells, never
+    shift codes or holiday banners. Columns are every day from the roster's first to its
+    last scheduled day. The bits are
+    packed eight days to a byte, so a 100-person yearly roster takes under 5 KB.
+    A person counts as working on a day when at least one cell schedules them on it.
+    """
+
+    __slots__ = ('people', 'first_day', 'n_days', 'bits', 'days')
+
+    def __init__(self, people: List[str], first_day: np.datetime64, n_days: int, bits: np.ndarray):
+        self.people = people
+        self.first_day = first_day
+        self.n_days = n_days
+        self.bits = bits
+        self.days = pd.date_range(pd.Timestamp(first_day), periods=n_days, freq='D') if n_days else \
+            pd.DatetimeIndex([])
+
+    @classmethod
+    def from_assignments(cls, assignments: pd.DataFrame) -> 'ScheduleMatrix':
+        scheduled = assignments[assignments['person'].notna()]
+        people = list(scheduled['person'].cat.remove_unused_categories().cat.categories)
+        if not people:
+            return cls([], np.datetime64('NaT', 'D'), 0, np.zeros((0, 0), dtype=np.uint8))
+        days = scheduled['date'].to_numpy().astype('datetime64[D]')
+        first_day = days.min()
+        n_days = int((days.max() - first_day).astype(int)) + 1
+        rows = pd.Categorical(scheduled['person'], categories=people).codes
+        works = np.zeros((len(people), n_days), dtype=bool)
+        works[rows, (days - first_day).astype(int)] = True
+        return cls(people, first_day, n_days, np.packbits(works, axis=1))
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    def works(self) -> np.ndarray:
+        """The matrix unpacked to booleans, people x days"""
+        return np.unpackbits(self.bits, axis=1, count=self.n_days).astype(bool)
+
+    def day_slice(self, start: Optional[date] = None, end: Optional[date] = None) -> slice:
+        """Columns for start through end (inclusive), clipped to the roster's days"""
+        lo = 0 if start is None else int((np.datetime64(start, 'D') - self.first_day).astype(int))
+        hi = self.n_days if end is None else int((np.datetime64(end, 'D') - self.first_day).astype(int)) + 1
+        return slice(min(max(lo, 0), self.n_days), min(max(hi, 0), self.n_days))
+
+    def daily_headcount(self, start: Optional[date] = None, end: Optional[date] = None) -> pd.Series:
+        """Number of people working on each day"""
+        columns = self.day_slice(start, end)
+        counts = self.works()[:, columns].sum(axis=0)
+        return pd.Series(counts, index=self.days[columns], name='headcount')
+
+    def monthly_counts(self) -> pd.DataFrame:
+        """Days worked per person per month: people as rows, months as columns"""
+        months = self.days.to_period('M')
+        month_codes, month_index = pd.factorize(months)
+        one_hot = np.zeros((self.n_days, len(month_index)), dtype=np.int32)
+        one_hot[np.arange(self.n_days), month_codes] = 1
+        counts = self.works().astype(np.int32) @ one_hot
+        return pd.DataFrame(counts, index=pd.Index(self.people, name='person'), columns=month_index)
+
+    def coverage_heatmap(self) -> pd.DataFrame:
+        """Headcount laid out as ISO weeks (rows) by weekday (columns, 1 = Monday)"""
+        counts = self.works().sum(axis=0)
+        # Pad the first week back to its Monday and the last to its Sunday, then fold by seven
+        lead = self.days[0].weekday() if self.n_days else 0
+        n_weeks = -(-(lead + self.n_days) // 7)
+        grid = np.zeros(n_weeks * 7, dtype=counts.dtype)
+        grid[lead:lead + self.n_days] = counts
+        mondays = (self.days[0] - pd.Timedelta(days=lead)) + pd.to_timedelta(np.arange(n_weeks) * 7, unit='D') \
+            if self.n_days else pd.DatetimeIndex([])
+        iso = mondays.isocalendar()
+        index = pd.MultiIndex.from_arrays([iso['year'].to_numpy(), iso['week'].to_numpy()], names=['year', 'week'])
+        return pd.DataFrame(grid.reshape(n_weeks, 7), index=index,
+                            columns=pd.Index(range(1, 8), name='weekday'))
+
+    def person_rows(self, names: List[str]) -> List[int]:
+        """
+        Matrix rows for names, matched case-insensitively: an exact name first, else the one
+        person whose name contains it. Raises ValueError for names that match nobody or several people.
+        """
+        lowered = [person.lower() for person in self.people]
+        rows = []
+        for name in names:
+            needle = ' '.join(name.lower().split())
+            if needle in lowered:
+                rows.append(lowered.index(needle))
+                continue
+            matches = [row for row, person in enumerate(lowered) if needle in person]
+            if len(matches) != 1:
+                found = ', '.join(self.people[row] for row in matches) or 'nobody'
+                raise ValueError(f"'{name}' should match one person in the roster, it matches {found}")
+            rows.append(matches[0])
+        return rows
+
+    def common_work_days(self, names: List[str], start: Optional[date] = None,
+                         end: Optional[date] = None) -> List[date]:
+        """Days on which all of names are scheduled"""
+        rows = self.person_rows(names)
+        if not rows:
+            return []
+        together = np.bitwise_and.reduce(self.bits[rows], axis=0)
+        return self._days_set(together, start, end)
+
+    def common_free_days(self, names: List[str], start: Optional[date] = None,
+                         end: Optional[date] = None) -> List[date]:
+        """Days within the roster's span on which none of names is scheduled"""
+        rows = self.person_rows(names)
+        if not rows:
+            return []
+        free = ~np.bitwise_or.reduce(self.bits[rows], axis=0)
+        return self._days_set(free, start, end)
+
+    def _days_set(self, packed: np.ndarray, start: Optional[date], end: Optional[date]) -> List[date]:
+        columns = self.day_slice(start, end)
+        hits = np.flatnonzero(np.unpackbits(packed, count=self.n_days)[columns]) + columns.start
+        return (self.first_day + hits).tolist()
@@ -0,0 +1,104 @@
+import html
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# A letter that str() of a number, date or duration can never produce ("1e+20",
+# "1 days 00:00:00"), so only a string cell can contain a query that has one
+_TEXT_ONLY_RE = re.compile(r'[^\W\d_adesy]')
+# Cells whose text lives in the sheet itself: formula strings, inline strings and booleans
+_INLINE_CELL_RE = re.compile(
+    rb'<(?:\w+:)?c\b[^>]*?\bt="(str|inlineStr|b)"(?:[^>]*?/>|[^>]*>(.*?)</(?:\w+:)?c>)', re.S)
+_TAG_RE = re.compile(rb'<[^>]+>')
+_SHARED_CELL_RE = re.compile(rb'<(?:\w+:)?c\b[^>]*?\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)<')
+
+
+def can_prefilter(name: str) -> bool:
+    return bool(_TEXT_ONLY_RE.search(name.lower()))
+
+
+def shared_string_sheets(file_path: str, name: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Check an xlsx workbook's shared strings for name without parsing any sheet.
+
+    Returns {'sheet_names': [...], 'candidates': [...]}, where candidates are the sheets
+    (in workbook order) that may contain name, or None when the file can't be prefiltered
+    (not an xlsx package, or a query that could also match a numeric cell).
+    """
+    if not can_prefilter(name):
+        return None
+    needle = name.lower()
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            sheets = _workbook_sheets(archive)
+            matching = _matching_shared_strings(archive, needle)
+            candidates = []
+            for sheet_name, part in sheets:
+                data = archive.read(part)
+                if _inline_text_matches(data, needle):
+                    candidates.append(sheet_name)
+                elif matching and any(int(idx) in matching for idx in _SHARED_CELL_RE.findall(data)):
+                    candidates.append(sheet_name)
+            return {'sheet_names': [sheet_name for sheet_name, _ in sheets], 'candidates': candidates}
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return None
+
+
+def xlsx_sheet_names(file_path: str) -> Optional[List[str]]:
+    """Sheet names of an xlsx workbook in workbook order, read from its manifest only"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return [sheet_name for sheet_name, _ in _workbook_sheets(archive)]
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return None
+
+
+def _workbook_sheets(archive: zipfile.ZipFile) -> List[tuple]:
+    """(sheet name, worksheet part) pairs in workbook order"""
+    rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for rel in rels.iter(f'{_PKG_REL_NS}Relationship'):
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            targets[rel.get('Id')] = target.lstrip('/')
+        else:
+            targets[rel.get('Id')] = posixpath.normpath(posixpath.join('xl', target))
+    workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+    return [(sheet.get('name'), targets[sheet.get(f'{_REL_NS}id')])
+            for sheet in workbook.iter(f'{_MAIN_NS}sheet')]
+
+
+def _inline_text_matches(data: bytes, needle: str) -> bool:
+    for cell_type, body in _INLINE_CELL_RE.findall(data):
+        text = html.unescape(_TAG_RE.sub(b'', body or b'').decode('utf-8')).lower()
+        if cell_type == b'b':
+            # Booleans come out of the readers as True/False
+            text = 'true' if text.strip() == '1' else 'false'
+        if needle in text:
+            return True
+    return False
+
+
+def _matching_shared_strings(archive: zipfile.ZipFile, needle: str) -> set:
+    """Indices of the shared strings containing needle, case-insensitively"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return set()
+    matching = set()
+    idx = 0
+    with archive.open('xl/sharedStrings.xml') as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag != f'{_MAIN_NS}si':
+                continue
+            # Rich text splits one string over several runs
+            text = ''.join(t.text or '' for t in elem.iter(f'{_MAIN_NS}t'))
+            if needle in text.lower():
+                matching.add(idx)
+            idx += 1
+            elem.clear()
+    return matching
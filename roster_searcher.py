@@ -1,26 +1,335 @@
+import numpy as np
 import pandas as pd
 import requests
-from datetime import datetime
+from collections import OrderedDict
+from datetime import date, datetime
+import hashlib
+import io
 import os
-import re
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import threading
+from typing import List, Dict, Optional, Tuple, Union
+
+import roster_cells
+from roster_assignment import Assignment, DateIndex, build_assignments, parse_day
+from roster_cache import RosterDiskCache
+from roster_index import RosterIndex
+from roster_matrix import ScheduleMatrix
+from roster_prefilter import shared_string_sheets, xlsx_sheet_names
+from roster_sources import load_sources
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
+# Text pandas' Excel reader turns into NaN by default (its na_values), and the error values
+# openpyxl hands back as text where pandas reads NaN
+_NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+    '#DIV/0!', '#NAME?', '#NULL!', '#NUM!', '#REF!', '#VALUE!', '#SPILL!', '#CALC!', '#GETTING_DATA',
+])
+
+
+class SearchCancelled(BaseException):
+    """
+    Raised from a progress callback to abort the search it reports on. Derives from
+    BaseException so the readers' error handling doesn't swallow it as a failed read.
+    """
+
 
 class RosterSearcher:
-    def __init__(self):
-        self.workbook_data = {}
+    # Reader engines by name, mapped to the method that implements them
+    READERS = {
+        'pandas': '_read_with_pandas',
+        'stream': '_read_streaming',
+        'calamine': '_read_calamine',
+    }
+
+    def __init__(self, max_cached_workbooks: int = 8, cache_dir: Optional[str] = None,
+                 max_cache_bytes: int = 256 * 1024 * 1024, stream_threshold_bytes: int = 5 * 1024 * 1024,
+                 reader: str = 'auto', prefilter: bool = True, workers: int = 0,
+                 parallel_min_bytes: int = 1024 * 1024, download_timeout: tuple = (10, 60),
+                 max_download_bytes: int = 100 * 1024 * 1024, year=None, debug: bool = False):
+        # Parsed workbooks, keyed by fingerprint, least recently used first
+        self.workbook_data = OrderedDict()
+        # Guards the caches when workbooks are loaded from several threads (see search_sources)
+        self._lock = threading.RLock()
+        # One lock per workbook key, so a workbook being loaded on one thread isn't parsed again on another.
+        # A key's lock lives while the key is cached or being loaded
+        self._key_locks = {}
+        self.max_cached_workbooks = max_cached_workbooks
+        # Per roster URL: fingerprint of the last good body, the body itself and its HTTP validators.
+        # A state goes when the workbook parsed from its body leaves the cache, see _cache_put
+        self._url_states = {}
+        self.disk_cache = RosterDiskCache(cache_dir, max_cache_bytes) if cache_dir else None
+        # Default reader engine; 'auto' picks calamine when installed, then the streaming
+        # reader for xlsx files of at least stream_threshold_bytes, then pandas
+        self.reader = reader
+        self.stream_threshold_bytes = stream_threshold_bytes
+        # Check xlsx shared strings for the name before parsing a workbook for a search
+        self.prefilter = prefilter
+        # Sheets of local workbooks of at least parallel_min_bytes are parsed and scanned for
+        # tables in a pool of this many processes; 0 or 1 keeps everything in-process
+        self.workers = workers
+        self.parallel_min_bytes = parallel_min_bytes
+        self._pool = None
+        # Roster URLs are fetched over one pooled session, with (connect, read) timeouts
+        # in seconds and a cap on the body size
+        self.download_timeout = download_timeout
+        self.max_download_bytes = max_download_bytes
+        # Year the week numbers of schedule tables fall in: None for the current year,
+        # a fixed year, or 'infer' to take it from the dates in the table's sheet
+        if year not in (None, 'infer') and not isinstance(year, int):
+            raise ValueError(f"year must be None, 'infer' or an int, not {year!r}")
+        self.year = year
+        self._session = None
+        # Print a preview of every table found; formatting the previews costs more than finding the tables
+        self.debug = debug
+        # Progress callback of the search running on each thread, see search_person_schedule
+        self._progress = threading.local()
         self.search_results = []
 
-    def read_excel_file(self, file_path: str, password: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    def close(self):
+        """Shut down the worker pool and HTTP session, if they were started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _report(self, stage: str, done: Optional[int] = None, total: Optional[int] = None):
+        callback = getattr(self._progress, 'callback', None)
+        if callback is not None:
+            callback(stage, done, total)
+
+    def read_excel_file(self, file_path: str, password: Optional[str] = None,
+                        reader: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Read every sheet of a workbook. reader overrides the searcher's default engine:
+        'pandas', 'stream' (openpyxl read-only rows, xlsx only), 'calamine' or 'auto'
+        """
+        return self.load_workbook(file_path, password, reader)['sheets']
+
+    def load_workbook(self, file_path: str, password: Optional[str] = None, reader: Optional[str] = None) -> Dict:
+        """
+        Return the parsed workbook as {'sheets': {name: DataFrame}, 'tables': {name: [table, ...]}},
+        served from the memory or disk cache when the file is unchanged
+        """
         try:
             if file_path.startswith(('http://', 'https://')):
-                return self._read_from_url(file_path)
+                return self._read_from_url(file_path, reader)
             elif os.path.exists(file_path):
-                return self._read_local_file(file_path, password)
+                engine = self._resolve_reader(reader, file_path, password)
+                key = self._workbook_key(self._file_fingerprint(file_path), engine)
+                return self._get_workbook(
+                    key, lambda sheet_names: self._parse_local_file(file_path, password, engine, sheet_names),
+                    persist=not password)
             else:
                 raise FileNotFoundError(f"File not found: {file_path}")
         except Exception as e:
             print(f"Error reading Excel file: {str(e)}")
-            return {}
+            return self._empty_workbook()
+
+    def _empty_workbook(self) -> Dict:
+        return {'sheets': {}, 'tables': {}}
+
+    def _get_workbook(self, key: str, parse, persist: bool = True, sheet_names: Optional[List[str]] = None,
+                      all_sheet_names: Optional[List[str]] = None) -> Dict:
+        """
+        Return the cached record for key, parsing what's missing with parse(names), where
+        names=None means every sheet. parse returns (sheets, tables), tables being None when
+        they still have to be detected. Passing sheet_names loads only those sheets; such a
+        partial record is filled in by later calls and only persisted once complete.
+        """
+        with self._loading(key):
+            entry = self._cache_get(key)
+            if entry is None and self.disk_cache and persist:
+                entry = self.disk_cache.get(key)
+            if entry is None:
+                entry = {'sheets': {}, 'tables': {}, 'complete': False}
+            if not entry.get('complete', True):
+                all_names = all_sheet_names or entry.get('sheet_names')
+                if sheet_names is not None:
+                    wanted = [n for n in sheet_names if n not in entry['sheets']]
+                elif all_names and entry['sheets']:
+                    # Finishing a partial record: only the sheets it doesn't have yet
+                    wanted = [n for n in all_names if n not in entry['sheets']]
+                else:
+                    wanted = None
+                if wanted is None or wanted:
+                    sheets_data, tables = parse(wanted)
+                    if not sheets_data and not entry['sheets']:
+                        # Failed reads come back empty; don't pin them in the cache
+                        return self._empty_workbook()
+                    order = all_names or (list(sheets_data) if wanted is None else None)
+                    self._add_sheets(entry, sheets_data, order, tables)
+                    if all_names:
+                        entry['sheet_names'] = list(all_names)
+                # Sheets asked for that didn't parse count as done, or the record would never be complete
+                tried = set(entry['sheets']).union(wanted or [])
+                entry['complete'] = wanted is None or (all_names is not None and tried.issuperset(all_names))
+                # Never write decrypted contents of password-protected workbooks to disk
+                if entry['complete'] and self.disk_cache and persist:
+                    self.disk_cache.put(key, entry)
+            self._cache_put(key, entry)
+            return entry
+
+    @contextmanager
+    def _loading(self, key: str):
+        while True:
+            with self._lock:
+                lock = self._key_locks.setdefault(key, threading.Lock())
+            # Poll so a search waiting on another thread's load can still be cancelled
+            while not lock.acquire(timeout=0.1):
+                self._report('waiting')
+            with self._lock:
+                if self._key_locks.get(key) is lock:
+                    break
+            # Dropped by _drop_key_lock before we got it; whoever loads next uses the new one
+            lock.release()
+        try:
+            yield
+        finally:
+            with self._lock:
+                # Failed and uncached loads keep nothing behind
+                if key not in self.workbook_data and self._key_locks.get(key) is lock:
+                    del self._key_locks[key]
+            lock.release()
+
+    def _drop_key_lock(self, key: str):
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is not None and not lock.locked():
+                del self._key_locks[key]
+
+    def _add_sheets(self, entry: Dict, sheets_data: Dict[str, pd.DataFrame], order: Optional[List[str]] = None,
+                    tables: Optional[Dict[str, List[Dict]]] = None):
+        # Fill copies and swap them in, so searches reading the cached entry on other threads
+        # never see a half-updated record
+        added = {'sheets': dict(entry['sheets']), 'tables': dict(entry['tables'])}
+        for done, (name, df) in enumerate(sheets_data.items(), 1):
+            if name not in added['sheets']:
+                if not tables:
+                    self._report('finding tables', done, len(sheets_data))
+                added['sheets'][name] = df
+                added['tables'][name] = tables[name] if tables else self.find_tables_in_sheet(df)
+        if order:
+            # Keep sheets in workbook order however they were loaded
+            rank = {name: i for i, name in enumerate(order)}
+            for part in ('sheets', 'tables'):
+                added[part] = dict(sorted(added[part].items(), key=lambda item: rank.get(item[0], len(rank))))
+        entry.update(added)
+        # The index and assignments table cover a fixed set of sheets; rebuild them on next use
+        entry.pop('index', None)
+        entry.pop('assignments', None)
+        entry.pop('date_index', None)
+        entry.pop('matrix', None)
+        entry.pop('sheet_spans', None)
+
+    def _load_for_search(self, file_path: str, person_name: str, password: Optional[str] = None) -> Dict:
+        """
+        load_workbook for a single search. An uncached local xlsx file is first checked
+        for the name in its shared strings, and only sheets that may contain it are parsed.
+        """
+        if not self.prefilter or password or file_path.startswith(('http://', 'https://')) \
+                or not os.path.exists(file_path):
+            return self.load_workbook(file_path, password)
+        engine = self._resolve_reader(None, file_path)
+        key = self._workbook_key(self._file_fingerprint(file_path), engine)
+        entry = self._cache_get(key)
+        if entry is None and self.disk_cache:
+            entry = self.disk_cache.get(key)
+            if entry is not None:
+                self._cache_put(key, entry)
+        if entry is not None and entry.get('complete', True):
+            return entry
+        hits = shared_string_sheets(file_path, person_name)
+        if hits is None:
+            return self.load_workbook(file_path, password)
+        if not hits['candidates']:
+            print(f"'{person_name}' does not occur in {file_path}, skipping it")
+            return self._empty_workbook()
+        try:
+            return self._get_workbook(
+                key, lambda sheet_names: self._parse_local_file(file_path, None, engine, sheet_names),
+                sheet_names=hits['candidates'], all_sheet_names=hits['sheet_names'])
+        except Exception as e:
+            print(f"Error reading Excel file: {str(e)}")
+            return self._empty_workbook()
+
+    def _file_fingerprint(self, file_path: str) -> str:
+        st = os.stat(file_path)
+        return f"file:{os.path.abspath(file_path)}:{st.st_size}:{st.st_mtime_ns}"
+
+    def _content_fingerprint(self, content: bytes) -> str:
+        return f"sha1:{hashlib.sha1(content).hexdigest()}"
+
+    def _workbook_key(self, fingerprint: str, engine: str) -> str:
+        # The engines don't produce identical frames, so each gets its own cache entry
+        return f"{fingerprint}|{engine}"
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self.workbook_data.get(key)
+            if entry is not None:
+                self.workbook_data.move_to_end(key)
+            return entry
+
+    def _cache_put(self, key: str, entry: Dict):
+        if self.max_cached_workbooks <= 0:
+            return
+        with self._lock:
+            self.workbook_data[key] = entry
+            self.workbook_data.move_to_end(key)
+            while len(self.workbook_data) > self.max_cached_workbooks:
+                evicted, _ = self.workbook_data.popitem(last=False)
+                self._drop_url_states(evicted)
+                self._drop_key_lock(evicted)
+
+    def _drop_url_states(self, key: str):
+        """Forget the bodies of roster URLs whose last download parsed to the workbook under key"""
+        with self._lock:
+            fingerprint = key.rsplit('|', 1)[0]
+            for url in [url for url, state in self._url_states.items() if state['key'] == fingerprint]:
+                del self._url_states[url]
+
+    def invalidate_cache(self, file_path: Optional[str] = None):
+        """Drop cached workbooks: all of them, or only those for file_path"""
+        if file_path is None:
+            with self._lock:
+                keys = list(self.workbook_data)
+                self.workbook_data.clear()
+                self._url_states.clear()
+                for key in keys:
+                    self._drop_key_lock(key)
+            if self.disk_cache:
+                self.disk_cache.clear()
+            return
+        if file_path.startswith(('http://', 'https://')):
+            with self._lock:
+                state = self._url_states.pop(file_path, None)
+            if state is None and self.disk_cache:
+                state = self.disk_cache.get_url_state(file_path)
+            keys = [self._workbook_key(state['key'], engine) for engine in self.READERS] if state else []
+            if self.disk_cache:
+                self.disk_cache.invalidate_url_state(file_path)
+        else:
+            prefix = f"file:{os.path.abspath(file_path)}:"
+            with self._lock:
+                keys = [k for k in self.workbook_data if k.startswith(prefix)]
+            if os.path.exists(file_path):
+                fingerprint = self._file_fingerprint(file_path)
+                keys.extend(self._workbook_key(fingerprint, engine) for engine in self.READERS)
+        for key in filter(None, keys):
+            with self._lock:
+                self.workbook_data.pop(key, None)
+                self._drop_key_lock(key)
+            if self.disk_cache:
+                self.disk_cache.invalidate(key)
 
     def _convert_sharepoint_url_to_download(self, url: str) -> str:
         if 'sharepoint.com/:x:/g/' in url:
@@ -29,54 +338,208 @@ class RosterSearcher:
             return download_url
         return url
 
-    def _read_from_url(self, url: str) -> Dict[str, pd.DataFrame]:
+    def _read_from_url(self, url: str, reader: Optional[str] = None) -> Dict:
+        state = self._fetch_url(url)
+        if state is None:
+            return self._empty_workbook()
+        workbook = self._workbook_from_url_state(state, reader)
+        if not workbook['sheets']:
+            # Unreadable bodies never get a cache entry to be evicted with
+            with self._lock:
+                if self._url_states.get(url) is state:
+                    del self._url_states[url]
+        return workbook
+
+    def _fetch_url(self, url: str) -> Optional[Dict]:
+        """
+        Download (or revalidate) a roster URL and return its state record
+        {'key', 'etag', 'last_modified', 'body'}, or None when it can't be fetched
+        """
+        source_url = url
         try:
             if 'sharepoint.com' in url:
                 url = self._convert_sharepoint_url_to_download(url)
             print(f"Attempting to download from: {url}")
-            response = requests.get(url)
-            response.raise_for_status()
-            temp_file = 'temp_excel.xlsx'
-            with open(temp_file, 'wb') as f:
-                f.write(response.content)
-            with open(temp_file, 'rb') as f:
-                sig = f.read(8)
-            is_xlsx = sig.startswith(b'PK\x03\x04')
-            is_xls = sig.startswith(b'\xD0\xCF\x11\xE0')
-            if not (is_xlsx or is_xls):
-                print("Downloaded file is not a valid Excel file. This may be an authentication page or error message.")
-                if os.path.exists(temp_file):
-                    os.remove(temp_file)
-                if 'sharepoint.com' in url:
-                    raise ValueError("SharePoint link format detected but couldn't download the Excel file directly. "
-                                     "Please open the link in your browser, download the file, and then select it using Browse.")
-                else:
-                    raise ValueError("Downloaded file is not a valid Excel file. Please check if the link requires authentication and download manually if needed.")
-            result = self._read_local_file(temp_file)
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-            return result
+            self._report('downloading')
+            state = self._url_state(source_url)
+            # Revalidate the last good copy instead of downloading it again
+            headers = {}
+            if state and state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state and state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+            content, response_headers = self._download(url, headers)
+            if content is None:
+                print("Roster unchanged on the server, using the cached copy")
+                return state
+            state = {
+                'key': self._content_fingerprint(content),
+                'etag': response_headers.get('ETag'),
+                'last_modified': response_headers.get('Last-Modified'),
+                'body': content,
+            }
+            if self.max_cached_workbooks > 0:
+                with self._lock:
+                    self._url_states[source_url] = state
+            if self.disk_cache and (state['etag'] or state['last_modified']):
+                self.disk_cache.put_url_state(source_url, state)
+            return state
         except requests.HTTPError as e:
             print(f"HTTP error reading from URL: {str(e)}")
             if ('sharepoint.com' in url or '1drv.ms' in url or 'onedrive.live.com' in url):
                 print("SharePoint/OneDrive link may require authentication. Please open in browser and download manually.")
-            return {}
+            return None
         except Exception as e:
             print(f"Error reading from URL: {str(e)}")
-            return {}
+            return None
+
+    def _workbook_from_url_state(self, state: Dict, reader: Optional[str] = None) -> Dict:
+        body = state['body']
+        try:
+            engine = self._resolve_reader(reader, content=body)
+            return self._get_workbook(self._workbook_key(state['key'], engine),
+                                      lambda sheet_names: (self._read_buffer(body, engine), None))
+        except Exception as e:
+            print(f"Error reading from URL: {str(e)}")
+            return self._empty_workbook()
+
+    def _url_state(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            state = self._url_states.get(url)
+        if state is None and self.disk_cache:
+            state = self.disk_cache.get_url_state(url)
+            if state is not None and self.max_cached_workbooks > 0:
+                with self._lock:
+                    self._url_states[url] = state
+        return state
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = requests.Session()
+            return self._session
+
+    def _download(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """
+        Stream url into memory, giving up as soon as the first bytes show it isn't an
+        Excel file or the body grows past max_download_bytes. Returns (body, response headers),
+        with body None when a conditional request came back 304 Not Modified.
+        """
+        buffer = io.BytesIO()
+        with self._get_session().get(url, headers=headers, stream=True, timeout=self.download_timeout) as response:
+            if response.status_code == 304 and headers:
+                return None, response.headers
+            response.raise_for_status()
+            declared = response.headers.get('Content-Length')
+            if declared and declared.isdigit() and int(declared) > self.max_download_bytes:
+                raise ValueError(f"Download is {int(declared)} bytes, more than the {self.max_download_bytes} byte limit")
+            total = int(declared) if declared and declared.isdigit() else None
+            checked = False
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                buffer.write(chunk)
+                self._report('downloading', buffer.tell(), total)
+                if buffer.tell() > self.max_download_bytes:
+                    raise ValueError(f"Download exceeds the {self.max_download_bytes} byte limit")
+                if not checked and buffer.tell() >= 8:
+                    self._check_excel_signature(buffer.getbuffer()[:8].tobytes(), url)
+                    checked = True
+            if not checked:
+                self._check_excel_signature(buffer.getvalue(), url)
+            return buffer.getvalue(), response.headers
+
+    def _check_excel_signature(self, sig: bytes, url: str):
+        is_xlsx = sig.startswith(b'PK\x03\x04')
+        is_xls = sig.startswith(b'\xD0\xCF\x11\xE0')
+        if not (is_xlsx or is_xls):
+            print("Downloaded file is not a valid Excel file. This may be an authentication page or error message.")
+            if 'sharepoint.com' in url:
+                raise ValueError("SharePoint link format detected but couldn't download the Excel file directly. "
+                                 "Please open the link in your browser, download the file, and then select it using Browse.")
+            else:
+                raise ValueError("Downloaded file is not a valid Excel file. Please check if the link requires authentication and download manually if needed.")
+
+    def _read_buffer(self, content: bytes, reader: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Parse a downloaded workbook straight from memory"""
+        return self._read_with(self._resolve_reader(reader, content=content), io.BytesIO(content))
+
+    def _parse_local_file(self, file_path: str, password: Optional[str] = None, reader: Optional[str] = None,
+                          sheet_names: Optional[List[str]] = None):
+        """Read sheets and detect their tables, in the worker pool when it's worth it"""
+        if self.workers > 1 and not password and os.path.getsize(file_path) >= self.parallel_min_bytes:
+            names = sheet_names if sheet_names is not None else xlsx_sheet_names(file_path)
+            # Pool startup only pays off with several sheets to spread
+            if names and len(names) > 1:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                sheets_data, tables = {}, {}
+                jobs = [(file_path, name, self._resolve_reader(reader, file_path), self.debug) for name in names]
+                # map() hands results back in submission order, i.e. workbook order
+                for done, (name, parsed) in enumerate(zip(names, self._pool.map(_parse_sheet, jobs)), 1):
+                    self._report('parsing', done, len(names))
+                    if parsed is not None:
+                        sheets_data[name], tables[name] = parsed
+                return sheets_data, tables
+        return self._read_local_file(file_path, password, reader, sheet_names), None
 
-    def _read_local_file(self, file_path: str, password: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    def _read_local_file(self, file_path: str, password: Optional[str] = None, reader: Optional[str] = None,
+                         sheet_names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        return self._read_with(self._resolve_reader(reader, file_path, password), file_path, password, sheet_names)
+
+    def _read_with(self, reader: str, source, password: Optional[str] = None,
+                   sheet_names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Run a named reader engine on a path or file-like object"""
+        if reader not in self.READERS:
+            raise ValueError(f"Unknown reader '{reader}', expected one of: auto, {', '.join(self.READERS)}")
+        return getattr(self, self.READERS[reader])(source, password, sheet_names)
+
+    def _resolve_reader(self, reader: Optional[str] = None, file_path: Optional[str] = None,
+                        password: Optional[str] = None, content: Optional[bytes] = None) -> str:
+        """
+        The engine that will read a workbook: reader or the searcher's default, with 'auto'
+        decided from file_path or the downloaded content, and calamine replaced by pandas
+        when it isn't installed
+        """
+        reader = reader or self.reader
+        if reader == 'auto':
+            if content is None:
+                reader = self._select_reader(file_path, password)
+            elif CalamineWorkbook is not None:
+                reader = 'calamine'
+            elif content.startswith(b'PK\x03\x04') and len(content) >= self.stream_threshold_bytes:
+                reader = 'stream'
+            else:
+                reader = 'pandas'
+        if reader == 'calamine' and CalamineWorkbook is None:
+            print("Warning: python-calamine is not installed, falling back to the pandas reader")
+            reader = 'pandas'
+        return reader
+
+    def _select_reader(self, file_path: str, password: Optional[str] = None) -> str:
+        # Only pandas can be handed a password; the others read the file as-is
+        if password:
+            return 'pandas'
+        extension = os.path.splitext(file_path)[1].lower()
+        if CalamineWorkbook is not None and extension in ('.xlsx', '.xlsm', '.xlsb', '.xls', '.ods'):
+            return 'calamine'
+        if extension in ('.xlsx', '.xlsm') and os.path.getsize(file_path) >= self.stream_threshold_bytes:
+            return 'stream'
+        return 'pandas'
+
+    def _read_with_pandas(self, file_path: str, password: Optional[str] = None,
+                          sheet_names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
         sheets_data = {}
         excel_file_obj = None
         engine_to_use = None
-        if file_path.lower().endswith('.xlsx'):
+        if isinstance(file_path, str) and file_path.lower().endswith('.xlsx'):
             engine_to_use = 'openpyxl'
         try:
             if password:
                 excel_file_obj = pd.ExcelFile(file_path, password=password, engine=engine_to_use)
             else:
                 excel_file_obj = pd.ExcelFile(file_path, engine=engine_to_use)
-            for sheet_name in excel_file_obj.sheet_names:
+            names = [n for n in excel_file_obj.sheet_names if sheet_names is None or n in sheet_names]
+            for done, sheet_name in enumerate(names, 1):
+                self._report('parsing', done, len(names))
                 try:
                     df = excel_file_obj.parse(sheet_name=sheet_name, header=None)
                     sheets_data[sheet_name] = df
@@ -97,22 +560,181 @@ class RosterSearcher:
                 except Exception as e_close:
                     print(f"Warning: Error closing Excel file object: {str(e_close)}")
 
+    def _read_streaming(self, file_path: str, password: Optional[str] = None,
+                        sheet_names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Read sheets straight from openpyxl's read-only row iterator, skipping pandas'
+        per-cell conversion and text parser. Cells convert as in the pandas path (see
+        _convert_cell), but pandas' per-column type inference is not repeated.
+        """
+        from openpyxl import load_workbook
+
+        sheets_data = {}
+        try:
+            workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        except Exception as e_file:
+            print(f"Error reading local file '{file_path}': {str(e_file)}")
+            return {}
+        try:
+            worksheets = [ws for ws in workbook.worksheets if sheet_names is None or ws.title in sheet_names]
+            for done, worksheet in enumerate(worksheets, 1):
+                self._report('parsing', done, len(worksheets))
+                try:
+                    sheets_data[worksheet.title] = self._rows_to_frame(worksheet.iter_rows(values_only=True))
+                except Exception as e_sheet:
+                    print(f"Warning: Could not read sheet '{worksheet.title}': {str(e_sheet)}")
+            return sheets_data
+        finally:
+            workbook.close()
+
+    def _read_calamine(self, file_path: str, password: Optional[str] = None,
+                       sheet_names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Read sheets with the Rust calamine parser, converting cells as the pandas path does.
+        calamine reads whitespace-only text as blank, which the cell types treat as empty anyway.
+        """
+        sheets_data = {}
+        try:
+            if isinstance(file_path, str):
+                workbook = CalamineWorkbook.from_path(file_path)
+            else:
+                workbook = CalamineWorkbook.from_filelike(file_path)
+        except Exception as e_file:
+            print(f"Error reading local file '{file_path}': {str(e_file)}")
+            return {}
+        try:
+            names = [n for n in workbook.sheet_names if sheet_names is None or n in sheet_names]
+            for done, sheet_name in enumerate(names, 1):
+                self._report('parsing', done, len(names))
+                try:
+                    rows = workbook.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+                    sheets_data[sheet_name] = self._rows_to_frame(rows)
+                except Exception as e_sheet:
+                    print(f"Warning: Could not read sheet '{sheet_name}': {str(e_sheet)}")
+            return sheets_data
+        finally:
+            workbook.close()
+
+    def _rows_to_frame(self, rows) -> pd.DataFrame:
+        data = []
+        last_row_with_data = -1
+        for row_number, row in enumerate(rows):
+            width = len(row)
+            while width and (row[width - 1] is None or row[width - 1] == ''):
+                width -= 1
+            if width:
+                last_row_with_data = row_number
+            data.append([self._convert_cell(v) for v in row[:width]])
+        data = data[:last_row_with_data + 1]
+        max_width = max((len(row) for row in data), default=0)
+        for row in data:
+            row.extend([np.nan] * (max_width - len(row)))
+        return pd.DataFrame(data)
+
+    @staticmethod
+    def _convert_cell(value):
+        # Match pandas' Excel readers: blanks, error cells and its NA strings as NaN,
+        # whole numbers as ints, dates as datetimes
+        if value is None or (isinstance(value, str) and value in _NA_STRINGS):
+            return np.nan
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else value
+        if isinstance(value, date) and not isinstance(value, datetime):
+            return datetime(value.year, value.month, value.day)
+        return value
+
+    def _sheet_masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Classify every cell of a sheet once (see roster_cells) and derive the masks the
+        table detectors need: non-missing cells, non-empty cells, "Week N" headers and
+        kandidaten headers, as boolean arrays shaped like df, plus the type array itself
+        """
+        values = df.to_numpy(dtype=object)
+        present = pd.notna(values)
+        types = roster_cells.classify_cells(values, present)
+        return {
+            'present': present,
+            'nonempty': types != roster_cells.EMPTY,
+            'week': types == roster_cells.WEEK,
+            'kandidaten': types == roster_cells.KANDIDATEN,
+            'types': types,
+        }
+
+    def _label_blocks(self, nonempty: np.ndarray):
+        """
+        Label 4-connected blocks of non-empty cells. Works on horizontal runs of
+        non-empty cells, so the cost follows the amount of data, not the sheet size.
+        Returns the label array (0 = empty) and each label's (top, left, bottom, right).
+        """
+        edges = np.diff(np.pad(nonempty.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        _, run_ends = np.nonzero(edges == -1)
+        run_rows, run_starts, run_ends = run_rows.tolist(), run_starts.tolist(), run_ends.tolist()
+        parent = list(range(len(run_rows)))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        # Runs come in row-major order; merge each run with overlapping runs of the row above
+        prev_lo = prev_hi = 0
+        cur_lo = 0
+        for k in range(len(run_rows)):
+            if k and run_rows[k] != run_rows[k - 1]:
+                if run_rows[k] == run_rows[k - 1] + 1:
+                    prev_lo, prev_hi = cur_lo, k
+                else:
+                    prev_lo = prev_hi = k
+                cur_lo = k
+            p = prev_lo
+            while p < prev_hi and run_ends[p] <= run_starts[k]:
+                p += 1
+            prev_lo = p
+            while p < prev_hi and run_starts[p] < run_ends[k]:
+                ra, rb = find(p), find(k)
+                if ra != rb:
+                    parent[max(ra, rb)] = min(ra, rb)
+                p += 1
+
+        labels = np.zeros(nonempty.shape, dtype=np.int32)
+        bounds = {}
+        for k in range(len(run_rows)):
+            label = find(k) + 1
+            r, start, end = run_rows[k], run_starts[k], run_ends[k]
+            labels[r, start:end] = label
+            top, left, bottom, right = bounds.get(label, (r, start, r, end - 1))
+            bounds[label] = (min(top, r), min(left, start), max(bottom, r), max(right, end - 1))
+        return labels, bounds
+
     def find_tables_in_sheet(self, df: pd.DataFrame) -> List[Dict]:
         tables = []
-        rows, cols = df.shape
-        for i in range(min(50, rows)):
-            for j in range(min(20, cols)):
-                cell_value = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
-                if re.match(r'Week\s*\d+', cell_value, re.IGNORECASE):
-                    table_info = self._extract_table_from_position(df, i, j)
-                    if table_info:
-                        tables.append(table_info)
-                elif 'kandidaten' in cell_value.lower():
-                    table_info = self._extract_kandidaten_table(df, i, j)
-                    if table_info:
-                        tables.append(table_info)
+        masks = self._sheet_masks(df)
+        labels, bounds = self._label_blocks(masks['nonempty'])
+        week_cells = list(zip(*(axis.tolist() for axis in np.nonzero(masks['week']))))
+        # Week headers of each block split it into one schedule table per header
+        headers_by_block = {}
+        for i, j in week_cells:
+            headers_by_block.setdefault(int(labels[i, j]), []).append((i, j))
+        # np.nonzero yields hits in row-major order, the order of the original cell walk
+        hit_rows, hit_cols = np.nonzero(masks['week'] | masks['kandidaten'])
+        for i, j in zip(hit_rows.tolist(), hit_cols.tolist()):
+            if masks['week'][i, j]:
+                block = int(labels[i, j])
+                table_info = self._extract_table_from_position(
+                    df, i, j, masks, bounds[block], headers_by_block[block])
+            else:
+                table_info = self._extract_kandidaten_table(df, i, j, masks)
+            if table_info:
+                tables.append(table_info)
+        year_hint = self._sheet_year(df, masks['types'])
+        for table in tables:
+            if table['type'] == 'schedule':
+                table['year_hint'] = year_hint
+                self._get_schedule_dates(table)
         # DEBUG: Print first 5 rows of each found table
-        if tables:
+        if tables and self.debug:
             print(f"\nDEBUG: Preview of found tables in this sheet:")
             for idx, table in enumerate(tables):
                 if 'data' in table:
@@ -124,47 +746,91 @@ class RosterSearcher:
                         print(cand)
         return tables
 
-    def _extract_table_from_position(self, df: pd.DataFrame, start_row: int, start_col: int) -> Dict:
+    def _extract_table_from_position(self, df: pd.DataFrame, start_row: int, start_col: int,
+                                     masks: Optional[Dict[str, np.ndarray]] = None,
+                                     block_bounds: Optional[tuple] = None,
+                                     block_headers: Optional[List[tuple]] = None) -> Dict:
         try:
-            max_row = start_row
-            max_col = start_col
-            for i in range(start_row, min(start_row + 50, len(df))):
-                has_data = False
-                for j in range(start_col, min(start_col + 20, len(df.columns))):
-                    if pd.notna(df.iloc[i, j]) and str(df.iloc[i, j]).strip():
-                        has_data = True
-                        max_col = max(max_col, j)
-                if has_data:
-                    max_row = i
-                else:
-                    break
+            if masks is None:
+                masks = self._sheet_masks(df)
+            if block_bounds is None:
+                labels, bounds = self._label_blocks(masks['nonempty'])
+                block_bounds = bounds[int(labels[start_row, start_col])]
+            _, _, bottom, right = block_bounds
+            # Another week header in the same block ends this table to its left or above it
+            next_row = bottom + 1
+            for i, j in block_headers or []:
+                if i == start_row and j > start_col:
+                    right = min(right, j - 1)
+            for i, j in block_headers or []:
+                if i > start_row and start_col <= j <= right:
+                    next_row = min(next_row, i)
+            block = masks['nonempty'][start_row:next_row, start_col:right + 1]
+            # The table runs down to the first row without data
+            row_has_data = block.any(axis=1)
+            n_rows = len(row_has_data) if row_has_data.all() else int(np.argmin(row_has_data))
+            if n_rows == len(row_has_data) and next_row <= bottom:
+                # Stacked directly on the next week: leave its date banner to it
+                while n_rows > 1 and self._is_date_row(masks['types'][start_row + n_rows - 1, start_col:right + 1]):
+                    n_rows -= 1
+            if n_rows == 0:
+                return None
+            col_has_data = np.flatnonzero(block[:n_rows].any(axis=0))
+            max_row = start_row + n_rows - 1
+            max_col = start_col + int(col_has_data[-1])
             if max_row > start_row and max_col > start_col:
                 table_data = df.iloc[start_row:max_row+1, start_col:max_col+1].copy()
+                cell_types = masks['types'][start_row:max_row+1, start_col:max_col+1].copy()
                 return {
                     'type': 'schedule',
                     'start_row': start_row,
                     'start_col': start_col,
                     'data': table_data,
-                    'header_row': 0
+                    'cell_types': cell_types,
+                    'header_row': 0,
+                    'week': roster_cells.week_number(df.iloc[start_row, start_col]),
+                    # ISO weekday of each day-name column in the header row
+                    'day_columns': {
+                        col: roster_cells.day_number(table_data.iloc[0, col])
+                        for col in np.flatnonzero(masks['types'][start_row, start_col:max_col+1]
+                                                  == roster_cells.DAY).tolist()
+                    },
+                    'number_rows': self._number_rows(table_data, cell_types)
                 }
         except Exception:
             pass
         return None
 
-    def _extract_kandidaten_table(self, df: pd.DataFrame, start_row: int, start_col: int) -> Dict:
+    def _sheet_year(self, df: pd.DataFrame, types: np.ndarray) -> Optional[int]:
+        """Most common year among the sheet's date cells, if it has any"""
+        years = {}
+        for value in df.to_numpy(dtype=object)[types == roster_cells.DATE].tolist():
+            if isinstance(value, date):
+                years[value.year] = years.get(value.year, 0) + 1
+        return max(years, key=lambda year: (years[year], year)) if years else None
+
+    def _is_date_row(self, types: np.ndarray) -> bool:
+        """Whether a row's cell types hold dates and nothing else but blanks"""
+        filled = types[types != roster_cells.EMPTY]
+        return len(filled) > 0 and bool((filled == roster_cells.DATE).all())
+
+    def _extract_kandidaten_table(self, df: pd.DataFrame, start_row: int, start_col: int,
+                                  masks: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         try:
+            if masks is None:
+                masks = self._sheet_masks(df)
+            present = masks['present'][start_row + 1:, start_col]
+            # The list runs down to the first missing cell
+            n_rows = len(present) if present.all() else int(np.argmin(present))
             candidates = []
-            for i in range(start_row + 1, min(start_row + 100, len(df))):
-                if pd.notna(df.iloc[i, start_col]):
-                    candidate = str(df.iloc[i, start_col]).strip()
-                    if candidate and not candidate.lower().startswith('week'):
-                        candidates.append({
-                            'number': i - start_row,
-                            'name': candidate,
-                            'row': i
-                        })
-                else:
-                    break
+            for offset, value in enumerate(df.iloc[start_row + 1:start_row + 1 + n_rows, start_col], start=1):
+                candidate = str(value).strip()
+                if candidate and not candidate.lower().startswith('week'):
+                    candidates.append({
+                        'number': offset,
+                        'name': candidate,
+                        'row': start_row + offset
+                    })
             if candidates:
                 return {
                     'type': 'kandidaten',
@@ -176,8 +842,9 @@ class RosterSearcher:
             pass
         return None
 
-    def search_name_in_tables(self, name: str, tables: List[Dict]) -> List[Dict]:
+    def search_name_in_tables(self, name: str, tables: List[Dict]) -> List[Assignment]:
         results = []
+        schedules = [table for table in tables if table['type'] == 'schedule']
         for table in tables:
             if table['type'] == 'schedule':
                 dates = self._search_in_schedule_table(name, table)
@@ -185,8 +852,9 @@ class RosterSearcher:
             elif table['type'] == 'kandidaten':
                 person_number = self._find_person_number(name, table)
                 if person_number:
-                    for other_table in tables:
-                        if other_table['type'] == 'schedule':
+                    # Join on each schedule's number -> rows map instead of rescanning it
+                    for other_table in schedules:
+                        if str(person_number) in self._table_number_rows(other_table):
                             dates = self._search_by_number_in_schedule(person_number, other_table)
                             results.extend(dates)
         return results
@@ -197,122 +865,372 @@ class RosterSearcher:
                 return candidate['number']
         return None
 
-    def _search_in_schedule_table(self, name: str, table: Dict) -> List[Dict]:
+    def _search_in_schedule_table(self, name: str, table: Dict) -> List[Assignment]:
         results = []
         df = table['data']
         dates = self._get_schedule_dates(table)
+        # Only a blank query can match an empty cell
+        types = self._table_cell_types(table) if name.strip() else None
         for i in range(1, len(df)):
             for col in dates:
+                if types is not None and types[i, col] == roster_cells.EMPTY:
+                    continue
                 cell_value = str(df.iloc[i, col]) if pd.notna(df.iloc[i, col]) else ""
                 if name.lower() in cell_value.lower():
                     date = dates.get(col)
                     if date:
-                        results.append({
-                            'name': name,
-                            'date': date,
-                            'position': f"Row {i+1}, Col {col+1}",
-                            'context': cell_value,
-                            'table_type': 'schedule'
-                        })
+                        results.append(Assignment(name, parse_day(date), i, col, cell_value, 'schedule'))
         return results
 
-    def _search_by_number_in_schedule(self, person_number: int, table: Dict) -> List[Dict]:
+    def _search_by_number_in_schedule(self, person_number: int, table: Dict) -> List[Assignment]:
         results = []
         df = table['data']
         dates = self._get_schedule_dates(table)
-        for i in range(1, len(df)):
-            if pd.notna(df.iloc[i, 0]) and str(df.iloc[i, 0]).strip() == str(person_number):
-                for col in dates:
-                    cell_value = str(df.iloc[i, col]) if pd.notna(df.iloc[i, col]) else ""
-                    if cell_value.strip():
-                        date = dates.get(col)
-                        if date:
-                            results.append({
-                                'name': f"Person #{person_number}",
-                                'date': date,
-                                'position': f"Row {i+1}, Col {col+1}",
-                                'context': cell_value,
-                                'table_type': 'schedule_by_number'
-                            })
+        for i in self._table_number_rows(table).get(str(person_number), []):
+            for col in dates:
+                cell_value = str(df.iloc[i, col]) if pd.notna(df.iloc[i, col]) else ""
+                if cell_value.strip():
+                    date = dates.get(col)
+                    if date:
+                        results.append(Assignment(f"Person #{person_number}", parse_day(date), i, col,
+                                                  cell_value, 'schedule_by_number'))
+        return results
+
+    def _number_rows(self, data: pd.DataFrame, types: np.ndarray) -> Dict[str, List[int]]:
+        """Person number -> rows carrying it in a schedule table's first column"""
+        number_rows = {}
+        for i in np.flatnonzero(types[1:, 0] == roster_cells.NUMBER).tolist():
+            number_rows.setdefault(str(data.iloc[i + 1, 0]).strip(), []).append(i + 1)
+        return number_rows
+
+    def _table_number_rows(self, table: Dict) -> Dict[str, List[int]]:
+        if 'number_rows' not in table:
+            table['number_rows'] = self._number_rows(table['data'], self._table_cell_types(table))
+        return table['number_rows']
+
+    def get_index(self, workbook: Dict) -> RosterIndex:
+        """Return the workbook's name index, building it on first use"""
+        if 'index' not in workbook:
+            self._report('indexing')
+            workbook['index'] = RosterIndex.build(workbook['tables'], self._get_schedule_dates, self._table_cell_types)
+        return workbook['index']
+
+    def get_assignments(self, workbook: Dict) -> pd.DataFrame:
+        """Return the workbook's normalized assignments table, building it on first use"""
+        if 'assignments' not in workbook:
+            assignments = build_assignments(self.get_index(workbook), workbook['tables'])
+            workbook['date_index'] = DateIndex(assignments)
+            workbook['assignments'] = assignments
+        return workbook['assignments']
+
+    def assignments(self, file_path: str, password: Optional[str] = None) -> pd.DataFrame:
+        """
+        The whole roster as one table with a row per person per scheduled cell: person,
+        person_number, date, weekday (1 = Monday), shift (the cell text), sheet, table, row,
+        col and table_type. Person, date and team questions become filters and groupbys on it.
+        """
+        workbook = self.load_workbook(file_path, password)
+        return self.get_assignments(workbook)
+
+    def get_matrix(self, workbook: Dict) -> ScheduleMatrix:
+        """Return the workbook's person x day matrix, building it on first use"""
+        if 'matrix' not in workbook:
+            workbook['matrix'] = ScheduleMatrix.from_assignments(self.get_assignments(workbook))
+        return workbook['matrix']
+
+    def schedule_matrix(self, file_path: str, password: Optional[str] = None) -> ScheduleMatrix:
+        """
+        Who works on which day across the whole roster, for headcount and coverage questions:
+        see ScheduleMatrix.daily_headcount, monthly_counts and coverage_heatmap
+        """
+        return self.get_matrix(self.load_workbook(file_path, password))
+
+    def common_work_days(self, file_path: str, names: List[str], date_range: Optional[Tuple] = None,
+                         password: Optional[str] = None) -> List[date]:
+        """Days, within the optional (start, end) date_range, on which all of names are scheduled"""
+        start, end = self._date_bounds(date_range)
+        return self.schedule_matrix(file_path, password).common_work_days(names, start, end)
+
+    def common_free_days(self, file_path: str, names: List[str], date_range: Optional[Tuple] = None,
+                         password: Optional[str] = None) -> List[date]:
+        """
+        Days, within the roster's span and the optional (start, end) date_range,
+        on which none of names is scheduled
+        """
+        start, end = self._date_bounds(date_range)
+        return self.schedule_matrix(file_path, password).common_free_days(names, start, end)
+
+    def _table_span(self, table: Dict) -> Optional[Tuple[str, str]]:
+        """First and last day ('YYYY-MM-DD') of a schedule table, None if it has no dated columns"""
+        dates = self._get_schedule_dates(table)
+        return (min(dates.values()), max(dates.values())) if dates else None
+
+    def _sheet_spans(self, workbook: Dict) -> Dict[str, Optional[Tuple[str, str]]]:
+        """
+        First and last scheduled day of every sheet, kept on the workbook record for as long
+        as the year the week numbers resolve to stays the same
+        """
+        year_setting = (self.year, datetime.now().year)
+        cached = workbook.get('sheet_spans')
+        if cached is not None and cached[0] == year_setting:
+            return cached[1]
+        spans = {}
+        for sheet_name, tables in workbook['tables'].items():
+            table_spans = [span for span in (self._table_span(table) for table in tables
+                                             if table['type'] == 'schedule') if span]
+            spans[sheet_name] = (min(span[0] for span in table_spans),
+                                 max(span[1] for span in table_spans)) if table_spans else None
+        workbook['sheet_spans'] = (year_setting, spans)
+        return spans
+
+    def _overlaps(self, span: Optional[Tuple[str, str]], first: Optional[str], last: Optional[str]) -> bool:
+        return span is not None and (last is None or span[0] <= last) and (first is None or span[1] >= first)
+
+    def _date_bounds(self, date_range: Optional[Tuple]) -> Tuple[Optional[date], Optional[date]]:
+        if date_range is None:
+            return None, None
+        start, end = date_range
+        return (pd.Timestamp(start).date() if start is not None else None,
+                pd.Timestamp(end).date() if end is not None else None)
+
+    def who_works_on(self, file_path: str, when: Union[date, str, Tuple], password: Optional[str] = None) -> pd.DataFrame:
+        """
+        Everyone scheduled on a day, or over a (start, end) range of days inclusive, as rows of
+        the assignments table in date order. Days may be dates, datetimes or 'YYYY-MM-DD' strings.
+        Shift codes are in the shift column; a day with only a holiday banner has no rows.
+        """
+        start, end = when if isinstance(when, tuple) else (when, when)
+        start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+        workbook = self.load_workbook(file_path, password)
+        assignments = self.get_assignments(workbook)
+        return assignments.iloc[workbook['date_index'].rows(start, end)]
+
+    def _search_name_with_index(self, name: str, sheet_name: str, tables: List[Dict],
+                                index: RosterIndex, matched: Dict, keep: Optional[set] = None) -> List[Assignment]:
+        """Index-backed equivalent of search_name_in_tables for one sheet, limited to the tables in keep if given"""
+        results = []
+        for table_idx, table in enumerate(tables):
+            if keep is not None and table_idx not in keep:
+                continue
+            if table['type'] == 'schedule':
+                for cell_id in matched.get((sheet_name, table_idx), []):
+                    _, _, i, col, date, cell_value = index.cells[cell_id]
+                    results.append(Assignment(name, parse_day(date), i, col, cell_value, 'schedule', sheet_name))
+            elif table['type'] == 'kandidaten':
+                person_number = self._find_person_number(name, table)
+                if person_number:
+                    for cell_id in index.cells_for_number(sheet_name, person_number):
+                        _, number_table, i, col, date, cell_value = index.cells[cell_id]
+                        if keep is not None and number_table not in keep:
+                            continue
+                        results.append(Assignment(f"Person #{person_number}", parse_day(date), i, col,
+                                                  cell_value, 'schedule_by_number', sheet_name))
         return results
 
     def _extract_dates_from_table(self, df: pd.DataFrame) -> Dict:
         dates = {}
-        for i in range(min(5, len(df))):
-            for j in range(len(df.columns)):
-                cell_value = str(df.iloc[i, j]) if pd.notna(df.iloc[i, j]) else ""
-                date_patterns = [
-                    r'\d{1,2}-\d{1,2}-\d{4}',
-                    r'\d{1,2}/\d{1,2}/\d{4}',
-                    r'\d{4}-\d{1,2}-\d{1,2}',
-                    r'\d{1,2}\.\d{1,2}\.\d{4}'
-                ]
-                for pattern in date_patterns:
-                    if re.search(pattern, cell_value):
-                        dates[f"{i}_{j}"] = cell_value
-                        dates[f"col_{j}"] = cell_value
-                        break
+        top = df.iloc[:5]
+        types = roster_cells.classify_cells(top.to_numpy(dtype=object))
+        for i, j in zip(*(axis.tolist() for axis in np.nonzero(types == roster_cells.DATE))):
+            cell_value = str(top.iloc[i, j])
+            dates[f"{i}_{j}"] = cell_value
+            dates[f"col_{j}"] = cell_value
         return dates
 
+    def _table_cell_types(self, table: Dict) -> np.ndarray:
+        """The table's cell types, classified on the spot for records made without them"""
+        if 'cell_types' not in table:
+            table['cell_types'] = roster_cells.classify_cells(table['data'].to_numpy(dtype=object))
+        return table['cell_types']
+
+    def _table_year(self, table: Dict) -> int:
+        if isinstance(self.year, int):
+            return self.year
+        if self.year == 'infer' and table.get('year_hint'):
+            return table['year_hint']
+        return datetime.now().year
+
     def _get_schedule_dates(self, table: Dict) -> Dict[int, str]:
-        df = table['data']
-        header = df.iloc[0]
-        week_cell = header.iloc[0]
-        match = re.search(r'\d+', str(week_cell))
-        if not match:
-            return {}
-        week_num = int(match.group())
-        year = datetime.now().year
-        day_map = {
-            'maandag': 1, 'dinsdag': 2, 'woensdag': 3, 'donderdag': 4,
-            'vrijdag': 5, 'zaterdag': 6, 'zondag': 7
-        }
+        """
+        Column -> 'YYYY-MM-DD' for the day columns of a schedule table. Worked out once
+        per table and year and kept on the table record as ('dates': (year, map)).
+        """
+        year = self._table_year(table)
+        cached = table.get('dates')
+        if cached is not None and cached[0] == year:
+            return cached[1]
+        if 'day_columns' in table:
+            week_num, day_columns = table['week'], table['day_columns']
+        else:
+            # Records made without the detector's fields
+            header = table['data'].iloc[0]
+            week_num = roster_cells.week_number(header.iloc[0])
+            day_columns = {col: roster_cells.day_number(header.iloc[col])
+                           for col in np.flatnonzero(self._table_cell_types(table)[0] == roster_cells.DAY).tolist()}
         dates = {}
-        for col_idx, cell in enumerate(header):
-            dayname = str(cell).strip().lower()
-            if dayname in day_map:
-                try:
-                    dt = datetime.fromisocalendar(year, week_num, day_map[dayname])
-                    dates[col_idx] = dt.strftime('%Y-%m-%d')
-                except Exception:
-                    pass
+        if week_num is not None:
+            for col_idx, weekday in day_columns.items():
+                day = roster_cells.iso_date(year, week_num, weekday)
+                if day:
+                    dates[col_idx] = day
+        # One assignment, so readers on other threads see either the old or the new pair
+        table['dates'] = (year, dates)
         return dates
 
-    def search_person_schedule(self, file_path: str, person_name: str, password: Optional[str] = None) -> List[Dict]:
+    def search_person_schedule(self, file_path: str, person_name: str, password: Optional[str] = None,
+                               progress=None, start=None, end=None) -> List[Assignment]:
         """
-        Main function to search for a person's schedule across all tables
+        Main function to search for a person's schedule across all tables.
+        progress, if given, is called as progress(stage, done, total) while the search runs
+        ('downloading' in bytes, 'parsing', 'finding tables' and 'searching' in sheets; done and
+        total may be None) and may raise SearchCancelled to abort it.
+        start and end (dates or 'YYYY-MM-DD', inclusive) limit the search to those days; week
+        tables and whole sheets outside them are skipped without looking at their cells.
         """
         print(f"Searching for '{person_name}' in {file_path}")
-        
-        # Read the Excel file
-        sheets_data = self.read_excel_file(file_path, password)
-        
-        if not sheets_data:
+        start, end = self._date_bounds((start, end))
+        self._progress.callback = progress
+        try:
+            # Read the Excel file; tables are detected once per workbook and cached with it
+            workbook = self._load_for_search(file_path, person_name, password)
+            
+            if not workbook['sheets']:
+                print("No data found in Excel file")
+                return []
+            
+            return self._search_workbook(workbook, person_name, verbose=True, start=start, end=end)
+        finally:
+            self._progress.callback = None
+
+    def preload(self, file_path: str, password: Optional[str] = None, progress=None) -> Dict:
+        """
+        Load, parse and index a workbook ahead of the searches that will need it.
+        progress works as in search_person_schedule. A search for the same workbook
+        started meanwhile waits for this load instead of parsing the file again.
+        """
+        self._progress.callback = progress
+        try:
+            workbook = self.load_workbook(file_path, password)
+            if workbook['sheets']:
+                self.get_index(workbook)
+            return workbook
+        finally:
+            self._progress.callback = None
+
+    def loaded_workbook(self, file_path: str, password: Optional[str] = None) -> Optional[Dict]:
+        """
+        The fully loaded workbook for file_path if it is already in memory, else None.
+        Never reads or downloads anything, so it is cheap enough to call on every keystroke.
+        """
+        if file_path.startswith(('http://', 'https://')):
+            with self._lock:
+                state = self._url_states.get(file_path)
+            key = self._workbook_key(state['key'], self._resolve_reader(content=state['body'])) if state else None
+        else:
+            try:
+                key = self._workbook_key(self._file_fingerprint(file_path),
+                                         self._resolve_reader(None, file_path, password))
+            except OSError:
+                key = None
+        with self._lock:
+            entry = self.workbook_data.get(key) if key else None
+        if entry is None or not entry.get('complete', True) or not entry['sheets']:
+            return None
+        return entry
+
+    def suggest_names(self, workbook: Dict, prefix: str, limit: int = 10) -> List[str]:
+        """Names in a loaded workbook with a word starting with prefix, most frequent first"""
+        return self.get_index(workbook).suggest(prefix, limit)
+
+    def search_loaded(self, workbook: Dict, person_name: str) -> List[Assignment]:
+        """Search a workbook returned by loaded_workbook, quietly and without loading anything"""
+        return self._search_workbook(workbook, person_name)
+
+    def search_many(self, file_path: str, names: List[str], password: Optional[str] = None) -> Dict[str, List[Assignment]]:
+        """
+        Search several people at once: the workbook is read and indexed once, and each name
+        is then a lookup in that index. Returns {name: results} in the order names were given.
+        """
+        print(f"Searching for {len(names)} names in {file_path}")
+        workbook = self.load_workbook(file_path, password)
+        if not workbook['sheets']:
             print("No data found in Excel file")
-            return []
-        
+            return {name: [] for name in names}
+        return {name: self._search_workbook(workbook, name) for name in names}
+
+    def search_sources(self, sources: List[str], person_name: str, password: Optional[str] = None,
+                       max_concurrent: int = 4, parse_workers: int = 2) -> List[Assignment]:
+        """
+        Search one person across several rosters (URLs or local paths) at once. Downloads run
+        concurrently, at most max_concurrent at a time, and each finished download is parsed
+        while the others are still coming in. Every result carries its roster in 'source'.
+        """
+        print(f"Searching for '{person_name}' in {len(sources)} rosters")
+        workbooks = load_sources(self, sources, password, max_concurrent, parse_workers)
+        all_results = []
+        for source, workbook in zip(sources, workbooks):
+            if not workbook['sheets']:
+                continue
+            for result in self._search_workbook(workbook, person_name):
+                result.source = source
+                all_results.append(result)
+        return all_results
+
+    def _search_workbook(self, workbook: Dict, person_name: str, verbose: bool = False,
+                         start: Optional[date] = None, end: Optional[date] = None) -> List[Assignment]:
         all_results = []
+        bounded = start is not None or end is not None
+        first = start.strftime('%Y-%m-%d') if start else None
+        last = end.strftime('%Y-%m-%d') if end else None
+        
+        # Matching cells come from the workbook index; queries it can't answer fall back to a scan.
+        # A date-bounded search doesn't build the index: scanning its few weeks is cheaper.
+        index = self.get_index(workbook) if not bounded or 'index' in workbook else None
+        cell_ids = index.find_cells(person_name) if index is not None else None
+        spans = self._sheet_spans(workbook) if bounded else None
+        matched = {}
+        for cell_id in cell_ids or []:
+            sheet_name, table_idx = index.cells[cell_id][:2]
+            matched.setdefault((sheet_name, table_idx), []).append(cell_id)
         
         # Process each sheet
-        for sheet_name, df in sheets_data.items():
-            print(f"\nProcessing sheet: {sheet_name}")
-            
-            # Find tables in this sheet
-            tables = self.find_tables_in_sheet(df)
-            print(f"Found {len(tables)} tables in sheet '{sheet_name}'")
+        for done, (sheet_name, tables) in enumerate(workbook['tables'].items(), 1):
+            self._report('searching', done, len(workbook['tables']))
+            keep = None
+            if bounded:
+                # Skip the whole sheet, then each week table, that lies outside the range
+                if not self._overlaps(spans.get(sheet_name), first, last):
+                    if verbose:
+                        print(f"\nSkipping sheet '{sheet_name}': no weeks in the requested range")
+                    continue
+                keep = {table_idx for table_idx, table in enumerate(tables)
+                        if table['type'] != 'schedule' or self._overlaps(self._table_span(table), first, last)}
+            if verbose:
+                print(f"\nProcessing sheet: {sheet_name}")
+                print(f"Found {len(tables)} tables in sheet '{sheet_name}'")
             
             # Search for the person in all tables
-            results = self.search_name_in_tables(person_name, tables)
+            if cell_ids is None:
+                in_range = tables if keep is None else [table for idx, table in enumerate(tables) if idx in keep]
+                results = self.search_name_in_tables(person_name, in_range)
+            else:
+                results = self._search_name_with_index(person_name, sheet_name, tables, index, matched, keep)
+            
+            # Add sheet info to results found by the scan
+            if cell_ids is None:
+                for result in results:
+                    result.sheet = sheet_name
             
-            # Add sheet info to results
-            for result in results:
-                result['sheet'] = sheet_name
+            # Weeks at the edges of the range may hold days outside it
+            if bounded:
+                results = [result for result in results
+                           if (start is None or result.date >= start) and (end is None or result.date <= end)]
             
             all_results.extend(results)
         
         return all_results
 
-    def display_results(self, results: List[Dict]):
+    def display_results(self, results: List[Assignment]):
         """Display search results in a formatted way"""
         if not results:
             print("No matches found.")
@@ -339,3 +1257,14 @@ class RosterSearcher:
                 print(f"Position: {result.get('position', '')}")
                 print(f"Table Type: {result.get('table_type', '')}")
                 print("-" * 30)
+
+
+def _parse_sheet(job):
+    """Process pool task: read one sheet and detect its tables"""
+    file_path, sheet_name, reader, debug = job
+    searcher = RosterSearcher(max_cached_workbooks=0, reader=reader, prefilter=False, debug=debug)
+    sheets_data = searcher._read_local_file(file_path, reader=reader, sheet_names=[sheet_name])
+    if sheet_name not in sheets_data:
+        return None
+    df = sheets_data[sheet_name]
+    return df, searcher.find_tables_in_sheet(df)
@@ -0,0 +1,41 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(('http://', 'https://'))
+
+
+async def load_sources_async(searcher, sources: List[str], password: Optional[str] = None,
+                             max_concurrent: int = 4, parse_workers: int = 2) -> List[Dict]:
+    """
+    Load several rosters concurrently and return their workbook records in the order of sources.
+
+    At most max_concurrent downloads are in flight at once. A finished download is handed to a
+    pool of parse_workers threads right away, so parsing overlaps the downloads still running.
+    A roster that can't be fetched or read comes back as an empty workbook.
+    """
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(max(1, max_concurrent))
+    parser = ThreadPoolExecutor(max_workers=max(1, parse_workers))
+
+    async def load(source: str) -> Dict:
+        if not _is_url(source):
+            return await loop.run_in_executor(parser, searcher.load_workbook, source, password)
+        async with limit:
+            state = await loop.run_in_executor(None, searcher._fetch_url, source)
+        if state is None:
+            return searcher._empty_workbook()
+        return await loop.run_in_executor(parser, searcher._workbook_from_url_state, state)
+
+    try:
+        return await asyncio.gather(*(load(source) for source in sources))
+    finally:
+        parser.shutdown(wait=False)
+
+
+def load_sources(searcher, sources: List[str], password: Optional[str] = None,
+                 max_concurrent: int = 4, parse_workers: int = 2) -> List[Dict]:
+    """Blocking wrapper around load_sources_async, for callers without an event loop"""
+    return asyncio.run(load_sources_async(searcher, sources, password, max_concurrent, parse_workers))
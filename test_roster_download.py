@@ -0,0 +1,95 @@
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openpyxl
+import pytest
+
+from roster_searcher import RosterSearcher
+
+
+def roster_bytes(name: str) -> bytes:
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet['A1'] = 'Week 10'
+    sheet['B1'] = 'maandag'
+    sheet['A2'] = 1
+    sheet['B2'] = name
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class RosterHandler(BaseHTTPRequestHandler):
+    """Serves server.body with server.etag and answers a matching If-None-Match with 304"""
+
+    def do_GET(self):
+        self.server.requests.append(self.headers.get('If-None-Match'))
+        if self.headers.get('If-None-Match') == self.server.etag:
+            self.server.statuses.append(304)
+            self.send_response(304)
+            self.send_header('ETag', self.server.etag)
+            self.end_headers()
+            return
+        self.server.statuses.append(200)
+        self.send_response(200)
+        self.send_header('ETag', self.server.etag)
+        self.send_header('Content-Length', str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RosterHandler)
+    httpd.body, httpd.etag = roster_bytes('Bram Jansen'), '"v1"'
+    httpd.requests, httpd.statuses = [], []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/rooster.xlsx"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def counting_searcher(**kwargs):
+    searcher = RosterSearcher(**kwargs)
+    searcher.parses = 0
+    read_buffer = searcher._read_buffer
+
+    def counted(content, reader=None):
+        searcher.parses += 1
+        return read_buffer(content, reader)
+
+    searcher._read_buffer = counted
+    return searcher
+
+
+def test_unchanged_roster_is_revalidated_not_parsed_again(server):
+    searcher = counting_searcher()
+    assert searcher.load_workbook(server.url)['sheets']
+    assert searcher.load_workbook(server.url)['sheets']
+    assert server.statuses == [200, 304]
+    assert server.requests == [None, '"v1"']
+    assert searcher.parses == 1
+
+
+def test_changed_roster_is_downloaded_and_parsed(server):
+    searcher = counting_searcher()
+    searcher.load_workbook(server.url)
+    server.body, server.etag = roster_bytes('Anna de Vries'), '"v2"'
+    workbook = searcher.load_workbook(server.url)
+    assert server.statuses == [200, 200]
+    assert searcher.parses == 2
+    assert 'Anna de Vries' in workbook['sheets']['Sheet'].to_numpy().tolist()[1]
+
+
+def test_validators_survive_restart_through_disk_cache(server, tmp_path):
+    counting_searcher(cache_dir=str(tmp_path)).load_workbook(server.url)
+    searcher = counting_searcher(cache_dir=str(tmp_path))
+    assert searcher.load_workbook(server.url)['sheets']
+    assert server.statuses == [200, 304]
+    assert searcher.parses == 0